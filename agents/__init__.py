@@ -1,41 +1,87 @@
-"""Multi-agent system using PydanticAI."""
+"""Multi-agent system using PydanticAI.
 
-from agents.intent_agent import IntentAgent
-from agents.analyse_handoff_agent import AnalyseHandoffAgent
-from agents.orchestrator_agent import OrchestratorAgent
-from agents.summary_agent import SummaryAgent
-from agents.predict_requirement_agent import PredictRequirementAgent
-from agents.classify_step_agent import ClassifyStepAgent
-from agents.profile_agent import ProfileAgent
-from agents.up_sales_cross_sales_agent import UpSalesCrossSalesAgent
-from agents.sales_agent import SalesAgent
-from agents.guardrail_agent import GuardrailAgent
-from agents.models import (
-    IntentAgentInput,
-    IntentAgentOutput,
-    AnalyseHandoffInput,
-    AnalyseHandoffOutput,
-    OrchestratorAgentInput,
-    OrchestratorAgentOutput,
-    PolicyFlags,
-    EmotionScore,
-    PredictRequirementInput,
-    PredictRequirementOutput,
-    ClassifyStepInput,
-    ClassifyStepOutput,
-    SalesGraph,
-    ProfileAgentInput,
-    ProfileAgentOutput,
-    HistoricalData,
-    Requirements,
-    ProductCombo,
-    UpSalesCrossSalesInput,
-    UpSalesCrossSalesOutput,
-    SalesAgentInput,
-    SalesAgentOutput,
-    GuardrailInput,
-    GuardrailOutput,
-)
+Exports are imported on first access (PEP 562), so importing one agent does not
+load every agent module and its model client.
+"""
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from agents.intent_agent import IntentAgent
+    from agents.analyse_handoff_agent import AnalyseHandoffAgent
+    from agents.orchestrator_agent import OrchestratorAgent
+    from agents.summary_agent import SummaryAgent
+    from agents.predict_requirement_agent import PredictRequirementAgent
+    from agents.classify_step_agent import ClassifyStepAgent
+    from agents.profile_agent import ProfileAgent
+    from agents.up_sales_cross_sales_agent import UpSalesCrossSalesAgent
+    from agents.sales_agent import SalesAgent
+    from agents.guardrail_agent import GuardrailAgent
+    from agents.models import (
+        IntentAgentInput,
+        IntentAgentOutput,
+        AnalyseHandoffInput,
+        AnalyseHandoffOutput,
+        OrchestratorAgentInput,
+        OrchestratorAgentOutput,
+        PolicyFlags,
+        EmotionScore,
+        PredictRequirementInput,
+        PredictRequirementOutput,
+        ClassifyStepInput,
+        ClassifyStepOutput,
+        SalesGraph,
+        ProfileAgentInput,
+        ProfileAgentOutput,
+        HistoricalData,
+        Requirements,
+        ProductCombo,
+        UpSalesCrossSalesInput,
+        UpSalesCrossSalesOutput,
+        SalesAgentInput,
+        SalesAgentOutput,
+        GuardrailInput,
+        GuardrailOutput,
+    )
+
+# Export name -> module that defines it
+_LAZY = {
+    "IntentAgent": "agents.intent_agent",
+    "AnalyseHandoffAgent": "agents.analyse_handoff_agent",
+    "OrchestratorAgent": "agents.orchestrator_agent",
+    "SummaryAgent": "agents.summary_agent",
+    "PredictRequirementAgent": "agents.predict_requirement_agent",
+    "ClassifyStepAgent": "agents.classify_step_agent",
+    "ProfileAgent": "agents.profile_agent",
+    "UpSalesCrossSalesAgent": "agents.up_sales_cross_sales_agent",
+    "SalesAgent": "agents.sales_agent",
+    "GuardrailAgent": "agents.guardrail_agent",
+    "IntentAgentInput": "agents.models",
+    "IntentAgentOutput": "agents.models",
+    "AnalyseHandoffInput": "agents.models",
+    "AnalyseHandoffOutput": "agents.models",
+    "OrchestratorAgentInput": "agents.models",
+    "OrchestratorAgentOutput": "agents.models",
+    "PolicyFlags": "agents.models",
+    "EmotionScore": "agents.models",
+    "PredictRequirementInput": "agents.models",
+    "PredictRequirementOutput": "agents.models",
+    "ClassifyStepInput": "agents.models",
+    "ClassifyStepOutput": "agents.models",
+    "SalesGraph": "agents.models",
+    "ProfileAgentInput": "agents.models",
+    "ProfileAgentOutput": "agents.models",
+    "HistoricalData": "agents.models",
+    "Requirements": "agents.models",
+    "ProductCombo": "agents.models",
+    "UpSalesCrossSalesInput": "agents.models",
+    "UpSalesCrossSalesOutput": "agents.models",
+    "SalesAgentInput": "agents.models",
+    "SalesAgentOutput": "agents.models",
+    "GuardrailInput": "agents.models",
+    "GuardrailOutput": "agents.models",
+}
 
 __all__ = [
     "IntentAgent",
@@ -73,3 +119,17 @@ __all__ = [
     "GuardrailInput",
     "GuardrailOutput",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    # Cache on the package so later lookups skip __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY))
@@ -0,0 +1,157 @@
+"""Micro-batching and bounded fan-out for independent agent calls.
+
+Concurrent calls that arrive within a short window are grouped and handed to
+a single batch handler, so N requests can share one LLM round-trip instead of
+paying N of them. Identical concurrent calls can also be collapsed into one
+in-flight call with SingleFlight.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+
+class _Bucket(Generic[T, R]):
+    """Pending items for one coalesce key."""
+
+    __slots__ = ("items", "futures", "full")
+
+    def __init__(self):
+        self.items: list[T] = []
+        self.futures: list[asyncio.Future[R]] = []
+        self.full = asyncio.Event()
+
+
+class AsyncBatcher(Generic[T, R]):
+    """Collects submitted items and flushes them to a batch handler.
+
+    A batch is flushed when it reaches max_batch items or max_wait_ms after its
+    first item arrived, whichever comes first. Items are only batched together
+    when they share the same coalesce key.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[list[T]], Awaitable[list[R]]],
+        max_batch: int = 8,
+        max_wait_ms: float = 20,
+    ):
+        """Initialize the batcher.
+
+        Args:
+            handler: Coroutine that processes a batch and returns results in the same order
+            max_batch: Maximum number of items per batch
+            max_wait_ms: Maximum time to wait for more items after the first one
+        """
+        self.handler = handler
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._buckets: dict[Hashable, _Bucket[T, R]] = {}
+        # Strong references so pending flush tasks are not garbage collected
+        self._tasks: set[asyncio.Task] = set()
+
+    async def submit(self, item: T, key: Hashable = None) -> R:
+        """Queue an item and wait for its result.
+
+        Args:
+            item: Item to process
+            key: Coalesce key; only items with equal keys share a batch
+
+        Returns:
+            The handler's result for this item
+        """
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = _Bucket()
+            self._buckets[key] = bucket
+            task = asyncio.create_task(self._flush_later(key, bucket))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        future: asyncio.Future[R] = asyncio.get_running_loop().create_future()
+        bucket.items.append(item)
+        bucket.futures.append(future)
+        if len(bucket.items) >= self.max_batch:
+            # Detach now so later submits start a new batch
+            self._buckets.pop(key, None)
+            bucket.full.set()
+
+        return await future
+
+    async def _flush_later(self, key: Hashable, bucket: _Bucket[T, R]) -> None:
+        try:
+            await asyncio.wait_for(bucket.full.wait(), timeout=self.max_wait)
+        except asyncio.TimeoutError:
+            pass
+        if self._buckets.get(key) is bucket:
+            del self._buckets[key]
+
+        try:
+            results = await self.handler(bucket.items)
+            if len(results) != len(bucket.items):
+                raise ValueError(
+                    f"Batch handler returned {len(results)} results for {len(bucket.items)} items"
+                )
+        except Exception as e:
+            for future in bucket.futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for future, result in zip(bucket.futures, results):
+            if not future.done():
+                future.set_result(result)
+
+
+class SingleFlight(Generic[R]):
+    """Collapses concurrent calls that share a key into a single in-flight call.
+
+    The first caller for a key starts the call; callers arriving before it
+    finishes await the same result instead of starting their own.
+    """
+
+    def __init__(self):
+        """Initialize with no calls in flight."""
+        self._in_flight: dict[Hashable, asyncio.Future[R]] = {}
+
+    async def run(self, key: Hashable, fn: Callable[[], Awaitable[R]]) -> R:
+        """Run fn, or join the in-flight call for key if there is one.
+
+        Args:
+            key: Identity of the call (e.g. agent namespace + prompt)
+            fn: Zero-argument coroutine function that performs the call
+
+        Returns:
+            The shared result
+        """
+        future = self._in_flight.get(key)
+        if future is None:
+            future = asyncio.ensure_future(fn())
+            self._in_flight[key] = future
+            future.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        # Shield so one caller being cancelled does not cancel the call for the others
+        return await asyncio.shield(future)
+
+
+async def gather_bounded(
+    fn: Callable[[T], Awaitable[R]], items: list[T], concurrency: int = 16
+) -> list[R]:
+    """Run fn over items concurrently, with at most `concurrency` calls in flight.
+
+    Args:
+        fn: Coroutine function applied to each item
+        items: Inputs to process
+        concurrency: Maximum number of concurrent calls
+
+    Returns:
+        Results in the same order as items
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(item: T) -> R:
+        async with semaphore:
+            return await fn(item)
+
+    return list(await asyncio.gather(*(one(item) for item in items)))
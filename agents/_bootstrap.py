@@ -0,0 +1,74 @@
+"""One-time process setup shared by the agents."""
+
+import os
+from functools import lru_cache
+
+import google.generativeai as genai
+import httpx
+from pydantic_ai.models.gemini import GeminiModel
+from pydantic_ai.providers.google_gla import GoogleGLAProvider
+
+_CONFIGURED = False
+
+
+def ensure_configured() -> None:
+    """Configure google.generativeai with GEMINI_API_KEY once per process.
+
+    Raises:
+        ValueError: If GEMINI_API_KEY is not set
+    """
+    global _CONFIGURED
+    if _CONFIGURED:
+        return
+
+    api_key = os.environ.get("GEMINI_API_KEY")
+    if not api_key:
+        raise ValueError("GEMINI_API_KEY environment variable is required")
+
+    genai.configure(api_key=api_key)
+    _CONFIGURED = True
+
+
+@lru_cache(maxsize=1)
+def _http_client() -> httpx.AsyncClient:
+    """Build the HTTP client shared by every Gemini request.
+
+    The connection pool is sized by GEMINI_MAX_CONNECTIONS (default 200) and
+    idle connections are kept alive, so concurrent chat sessions reuse TLS
+    connections instead of queueing on httpx's default 100/20 limits. When the
+    optional ``httpx-aiohttp`` package is installed, requests go through an
+    aiohttp transport, which holds up better under high concurrency.
+
+    Returns:
+        Shared httpx.AsyncClient
+    """
+    max_connections = int(os.environ.get("GEMINI_MAX_CONNECTIONS", "200"))
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_connections,
+        keepalive_expiry=60,
+    )
+    try:
+        from httpx_aiohttp import AiohttpTransport
+    except ImportError:
+        transport = httpx.AsyncHTTPTransport(limits=limits)
+    else:
+        transport = AiohttpTransport(limits=limits)
+    return httpx.AsyncClient(transport=transport, timeout=httpx.Timeout(600, connect=5))
+
+
+@lru_cache(maxsize=8)
+def get_model(model_name: str) -> GeminiModel:
+    """Return the process-wide GeminiModel for a model name.
+
+    Agents on the same model share one instance, and every model shares one
+    pooled HTTP client.
+
+    Args:
+        model_name: Gemini model name
+
+    Returns:
+        Shared GeminiModel
+    """
+    ensure_configured()
+    return GeminiModel(model_name, provider=GoogleGLAProvider(http_client=_http_client()))
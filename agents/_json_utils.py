@@ -0,0 +1,132 @@
+"""Helpers for pulling JSON out of free-form LLM responses."""
+
+from typing import Any, Optional, TypeVar, Union
+
+import orjson
+import pyjson5
+from pydantic import BaseModel, ValidationError
+
+M = TypeVar("M", bound=BaseModel)
+
+
+def extract_json(text: str) -> Optional[str]:
+    """Find the first balanced JSON object in a text response.
+
+    Scans the text once, tracking brace depth and skipping braces that appear
+    inside JSON strings, so trailing prose or a second JSON block after the
+    first object does not get swallowed the way a greedy ``\\{.*\\}`` match would.
+
+    Args:
+        text: Raw response text that may contain a JSON object
+
+    Returns:
+        The ``{...}`` slice of the first complete object, or None if not found
+    """
+    start = text.find("{")
+    if start == -1:
+        return None
+
+    depth = 0
+    in_string = False
+    escape = False
+    for i in range(start, len(text)):
+        ch = text[i]
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start : i + 1]
+
+    return None
+
+
+def _loads_json5(text: str) -> Any:
+    """Parse relaxed JSON (trailing commas, single quotes, comments, bare keys).
+
+    Args:
+        text: Candidate JSON5 text
+
+    Returns:
+        Parsed value, or None if the text does not parse
+    """
+    try:
+        return pyjson5.loads(text)
+    except pyjson5.Json5Exception:
+        return None
+
+
+def load_json_object(text: str) -> Optional[dict[str, Any]]:
+    """Parse the JSON object in a text response.
+
+    Tries the whole text first and falls back to the first balanced object
+    found by extract_json(). If neither is strict JSON, the object is given a
+    second, lenient JSON5 pass before giving up.
+
+    Args:
+        text: Raw response text
+
+    Returns:
+        Parsed dict, or None if no valid JSON object was found
+    """
+    data = None
+    if text.lstrip().startswith("{"):
+        try:
+            data = orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass
+
+    if data is None:
+        block = extract_json(text)
+        if block is None:
+            return None
+        try:
+            data = orjson.loads(block)
+        except orjson.JSONDecodeError:
+            # Only malformed responses pay for the slower lenient parser
+            data = _loads_json5(block)
+
+    return data if isinstance(data, dict) else None
+
+
+def try_parse_agent_json(
+    output: Union[str, dict[str, Any], BaseModel],
+    model_cls: type[M],
+    defaults: Optional[dict[str, Any]] = None,
+) -> Optional[M]:
+    """Parse an agent response into an output model.
+
+    Args:
+        output: Agent result output; raw text is parsed, while a dict or an
+            instance of model_cls (structured output) skips JSON decoding
+        model_cls: Pydantic output model to validate into
+        defaults: Values for fields the response left out
+
+    Returns:
+        Validated model instance, or None if no valid object could be parsed
+    """
+    if isinstance(output, model_cls):
+        return output
+    if isinstance(output, BaseModel):
+        data = output.model_dump()
+    elif isinstance(output, dict):
+        data = output
+    else:
+        data = load_json_object(output)
+
+    if data is None:
+        return None
+    try:
+        return model_cls.model_validate({**defaults, **data} if defaults else data)
+    except ValidationError:
+        return None
+
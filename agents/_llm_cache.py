@@ -0,0 +1,187 @@
+"""Response cache for LLM calls.
+
+Agents with deterministic prompts (same system prompt + same user prompt) can
+reuse a previous structured output instead of issuing another Gemini call.
+
+Environment variables (optional):
+- LLM_CACHE_BACKEND: "memory" (default), "redis", or "none" to disable
+- LLM_CACHE_TTL: entry lifetime in seconds (default: 3600)
+- LLM_CACHE_SIZE: max entries for the in-memory backend (default: 1024)
+- LLM_CACHE_EXCLUDE: comma-separated agent names that should always call the
+  model, e.g. "SalesAgent" for fresh conversational replies (default: none)
+"""
+
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Optional, Protocol
+
+
+def make_key(*parts: str) -> str:
+    """Build a cache key from the parts that determine an LLM response.
+
+    Args:
+        parts: Strings such as agent name, model name, system prompt, user prompt
+
+    Returns:
+        Hex SHA-256 digest of the parts
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class CacheBackend(Protocol):
+    """Storage used by LLMCache."""
+
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    async def set(self, key: str, payload: bytes, ttl: int) -> None: ...
+
+
+class MemoryLRU:
+    """Size-bounded in-process LRU with per-entry expiry."""
+
+    def __init__(self, max_size: int = 1024):
+        """Initialize the LRU.
+
+        Args:
+            max_size: Maximum number of entries kept
+        """
+        self.max_size = max_size
+        self._data: OrderedDict[str, tuple[float, bytes]] = OrderedDict()
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return the payload for key, or None if missing or expired."""
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, payload = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return payload
+
+    async def set(self, key: str, payload: bytes, ttl: int) -> None:
+        """Store payload under key, evicting the least recently used entries."""
+        self._data[key] = (time.monotonic() + ttl, payload)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+
+class RedisBackend:
+    """Redis-backed storage shared across worker processes."""
+
+    def __init__(self, key_prefix: str = "agent:llm_cache:"):
+        """Initialize the Redis backend from database settings.
+
+        Args:
+            key_prefix: Prefix for cache keys in Redis
+        """
+        from redis.asyncio import Redis
+        from database.connection import DatabaseSettings
+
+        settings = DatabaseSettings()
+        self.key_prefix = key_prefix
+        self._client = Redis(
+            host=settings.redis_host,
+            port=settings.redis_port,
+            db=settings.redis_db,
+        )
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return the payload for key, treating Redis errors as a miss."""
+        from redis.exceptions import RedisError
+
+        try:
+            return await self._client.get(self.key_prefix + key)
+        except RedisError:
+            return None
+
+    async def set(self, key: str, payload: bytes, ttl: int) -> None:
+        """Store payload under key with a TTL, ignoring Redis errors."""
+        from redis.exceptions import RedisError
+
+        try:
+            await self._client.set(self.key_prefix + key, payload, ex=ttl)
+        except RedisError:
+            pass
+
+
+class LLMCache:
+    """Async get/set facade over a cache backend."""
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        default_ttl: int = 3600,
+        exclude: frozenset[str] = frozenset(),
+    ):
+        """Initialize the cache.
+
+        Args:
+            backend: Storage backend (None disables caching)
+            default_ttl: Default entry lifetime in seconds
+            exclude: Agent names for which for_agent() returns a disabled cache
+        """
+        self.backend = backend
+        self.default_ttl = default_ttl
+        self.exclude = exclude
+
+    def for_agent(self, name: str) -> "LLMCache":
+        """Return this cache, or a disabled one if the agent is excluded.
+
+        Args:
+            name: Agent name (e.g. "SalesAgent")
+
+        Returns:
+            Cache the agent should use
+        """
+        if name in self.exclude:
+            return LLMCache(backend=None, default_ttl=self.default_ttl)
+        return self
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return the cached payload for key, or None on miss."""
+        if self.backend is None:
+            return None
+        return await self.backend.get(key)
+
+    async def set(self, key: str, payload: bytes, ttl: Optional[int] = None) -> None:
+        """Cache payload under key.
+
+        Args:
+            key: Cache key from make_key()
+            payload: Serialized output (e.g. model_dump_json().encode())
+            ttl: Entry lifetime in seconds (defaults to default_ttl)
+        """
+        if self.backend is None:
+            return
+        await self.backend.set(key, payload, ttl or self.default_ttl)
+
+
+def _build_cache() -> LLMCache:
+    backend_name = os.getenv("LLM_CACHE_BACKEND", "memory").strip().lower()
+    ttl = int(os.getenv("LLM_CACHE_TTL", "3600"))
+    exclude = frozenset(
+        name.strip() for name in os.getenv("LLM_CACHE_EXCLUDE", "").split(",") if name.strip()
+    )
+
+    backend: Optional[CacheBackend]
+    if backend_name == "redis":
+        backend = RedisBackend()
+    elif backend_name in {"none", "off", "false", "0"}:
+        backend = None
+    else:
+        backend = MemoryLRU(max_size=int(os.getenv("LLM_CACHE_SIZE", "1024")))
+
+    return LLMCache(backend=backend, default_ttl=ttl, exclude=exclude)
+
+
+# Process-wide cache shared by all agent instances
+llm_cache = _build_cache()
@@ -0,0 +1,23 @@
+"""Shared Gemini request settings."""
+
+from pydantic_ai.models.gemini import GeminiModelSettings
+
+
+def fast_json_settings(model_name: str) -> GeminiModelSettings:
+    """Build latency-oriented settings for agents that return a small JSON object.
+
+    Uses temperature 0 (deterministic, which also makes response caching
+    meaningful) and disables thinking where the model allows it, so the model
+    starts emitting the answer immediately.
+
+    Args:
+        model_name: Gemini model name the settings are for
+
+    Returns:
+        GeminiModelSettings to pass as Agent(model_settings=...)
+    """
+    settings = GeminiModelSettings(temperature=0.0)
+    # Flash models accept a zero thinking budget; Pro models always think
+    if "flash" in model_name:
+        settings["gemini_thinking_config"] = {"thinking_budget": 0}
+    return settings
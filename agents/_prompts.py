@@ -0,0 +1,27 @@
+"""Prompt fragments shared by several agents."""
+
+from typing import Any, Sequence
+
+
+def format_short_memory(short_memory: Sequence[Any], limit: int = 20) -> str:
+    """Render the most recent conversation messages as a numbered prompt section.
+
+    Args:
+        short_memory: Messages as role/content dicts or plain strings
+        limit: Number of most recent messages to include
+
+    Returns:
+        The "Recent conversation history" section, or "" when there is no history
+    """
+    recent = short_memory[-limit:]
+    if not recent:
+        return ""
+    # The workflow passes either all dicts or all strings, so pick the format once
+    if isinstance(recent[0], dict):
+        lines = [
+            f"{i}. [{msg.get('role', 'unknown')}]: {msg.get('content', '')}"
+            for i, msg in enumerate(recent, 1)
+        ]
+    else:
+        lines = [f"{i}. {msg}" for i, msg in enumerate(recent, 1)]
+    return "\n\nRecent conversation history:\n" + "\n".join(lines) + "\n"
@@ -0,0 +1,182 @@
+"""Embedding-based cache for paraphrased user messages.
+
+The exact-match LLM cache misses near-duplicate phrasings ("my order is late"
+vs "order hasn't arrived") that should get the same intent or handoff
+analysis. This cache embeds the raw message and reuses a stored output when
+the cosine similarity to a previous message clears a threshold.
+
+Vectors are L2-normalized and kept as FP16 numpy matrices per namespace, so a
+lookup is a single brute-force inner product (equivalent to a flat IP index,
+which is fast enough for a few thousand entries).
+
+Requires the optional ``fastembed`` package.
+
+Environment variables (optional):
+- SEMANTIC_CACHE_ENABLED: "true" to enable (default: disabled)
+- SEMANTIC_CACHE_MODEL: embedding model (default: sentence-transformers/all-MiniLM-L6-v2)
+- SEMANTIC_CACHE_THRESHOLD: minimum cosine similarity for a hit (default: 0.92)
+- SEMANTIC_CACHE_SIZE: max entries per namespace (default: 4096)
+- SEMANTIC_CACHE_DIR: directory to load the index from and save it to on exit
+"""
+
+import asyncio
+import atexit
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import orjson
+
+DEFAULT_EMBED_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+
+class SemanticCache:
+    """Nearest-neighbour cache of serialized agent outputs keyed by message embedding."""
+
+    def __init__(
+        self,
+        embed_model: str = DEFAULT_EMBED_MODEL,
+        threshold: float = 0.92,
+        max_entries: int = 4096,
+        cache_dir: Optional[str] = None,
+    ):
+        """Initialize the semantic cache.
+
+        Args:
+            embed_model: fastembed model name used to embed messages
+            threshold: Minimum cosine similarity for a cache hit
+            max_entries: Max entries per namespace (oldest are dropped first)
+            cache_dir: Directory for persisting the index (None keeps it in memory only)
+        """
+        self.embed_model = embed_model
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._embedder = None
+        self._vectors: dict[str, np.ndarray] = {}
+        self._payloads: dict[str, list[bytes]] = {}
+        # Recent message embeddings, so add() after a missed lookup() does not re-embed
+        self._recent: OrderedDict[str, np.ndarray] = OrderedDict()
+
+    def _embed_sync(self, text: str) -> np.ndarray:
+        if self._embedder is None:
+            from fastembed import TextEmbedding
+
+            self._embedder = TextEmbedding(self.embed_model)
+        vector = next(iter(self._embedder.embed([text])))
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector = vector / norm
+        return vector.astype(np.float16)
+
+    async def _embed(self, text: str) -> np.ndarray:
+        vector = self._recent.get(text)
+        if vector is not None:
+            self._recent.move_to_end(text)
+            return vector
+        # Embedding is CPU-bound; keep it off the event loop
+        vector = await asyncio.to_thread(self._embed_sync, text)
+        self._recent[text] = vector
+        while len(self._recent) > 256:
+            self._recent.popitem(last=False)
+        return vector
+
+    async def lookup(self, namespace: str, text: str) -> Optional[bytes]:
+        """Return the payload of the most similar cached message, if similar enough.
+
+        Args:
+            namespace: Cache partition (e.g. agent + language)
+            text: Raw user message
+
+        Returns:
+            Stored payload, or None on miss
+        """
+        vectors = self._vectors.get(namespace)
+        if vectors is None or len(vectors) == 0:
+            return None
+        query = await self._embed(text)
+        scores = vectors.astype(np.float32) @ query.astype(np.float32)
+        best = int(np.argmax(scores))
+        if scores[best] < self.threshold:
+            return None
+        return self._payloads[namespace][best]
+
+    async def add(self, namespace: str, text: str, payload: bytes) -> None:
+        """Store a payload for a message.
+
+        Args:
+            namespace: Cache partition (e.g. agent + language)
+            text: Raw user message
+            payload: Serialized output (e.g. model_dump_json().encode())
+        """
+        vector = await self._embed(text)
+        vectors = self._vectors.get(namespace)
+        payloads = self._payloads.setdefault(namespace, [])
+        if vectors is None:
+            vectors = vector[None, :]
+        else:
+            vectors = np.vstack([vectors, vector[None, :]])
+        payloads.append(payload)
+        if len(payloads) > self.max_entries:
+            overflow = len(payloads) - self.max_entries
+            vectors = vectors[overflow:]
+            del payloads[:overflow]
+        self._vectors[namespace] = vectors
+
+    def save(self) -> None:
+        """Write the index to cache_dir (no-op when persistence is disabled)."""
+        if self.cache_dir is None or not self._vectors:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        namespaces = sorted(self._vectors)
+        np.savez(
+            self.cache_dir / "vectors.npz",
+            **{f"ns{i}": self._vectors[ns] for i, ns in enumerate(namespaces)},
+        )
+        meta = {
+            "embed_model": self.embed_model,
+            "namespaces": [
+                {"name": ns, "payloads": [p.decode() for p in self._payloads[ns]]}
+                for ns in namespaces
+            ],
+        }
+        (self.cache_dir / "payloads.json").write_bytes(orjson.dumps(meta))
+
+    def load(self) -> None:
+        """Read a previously saved index from cache_dir, if present."""
+        if self.cache_dir is None:
+            return
+        vectors_path = self.cache_dir / "vectors.npz"
+        meta_path = self.cache_dir / "payloads.json"
+        if not vectors_path.exists() or not meta_path.exists():
+            return
+        meta = orjson.loads(meta_path.read_bytes())
+        if meta.get("embed_model") != self.embed_model:
+            # Vectors from a different model are not comparable
+            return
+        with np.load(vectors_path) as data:
+            for i, entry in enumerate(meta["namespaces"]):
+                self._vectors[entry["name"]] = data[f"ns{i}"]
+                self._payloads[entry["name"]] = [p.encode() for p in entry["payloads"]]
+
+
+def _build_cache() -> Optional[SemanticCache]:
+    if os.getenv("SEMANTIC_CACHE_ENABLED", "false").strip().lower() not in {"true", "1", "yes"}:
+        return None
+
+    cache = SemanticCache(
+        embed_model=os.getenv("SEMANTIC_CACHE_MODEL", DEFAULT_EMBED_MODEL),
+        threshold=float(os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.92")),
+        max_entries=int(os.getenv("SEMANTIC_CACHE_SIZE", "4096")),
+        cache_dir=os.getenv("SEMANTIC_CACHE_DIR") or None,
+    )
+    cache.load()
+    atexit.register(cache.save)
+    return cache
+
+
+# Process-wide semantic cache (None when disabled)
+semantic_cache = _build_cache()
@@ -0,0 +1,47 @@
+"""Time limits for LLM calls.
+
+Gemini latency is heavy-tailed: a call that is still running well past the
+usual latency is more likely stuck than slow, and a fresh attempt usually
+returns sooner than waiting it out.
+
+Environment variables (optional):
+- GEMINI_TIMEOUT: seconds allowed per attempt (default: 10)
+"""
+
+import asyncio
+import os
+from typing import Awaitable, Callable, Optional, TypeVar
+
+R = TypeVar("R")
+
+REQUEST_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", "10"))
+
+
+async def run_with_timeout(
+    fn: Callable[..., Awaitable[R]],
+    *args,
+    timeout: Optional[float] = None,
+    retries: int = 1,
+) -> R:
+    """Await fn(*args), restarting it if an attempt exceeds the time limit.
+
+    Args:
+        fn: Coroutine function to call, e.g. agent.run
+        args: Positional arguments for fn
+        timeout: Seconds per attempt (defaults to REQUEST_TIMEOUT)
+        retries: Extra attempts after the first one times out
+
+    Returns:
+        The result of the first attempt that finishes in time
+
+    Raises:
+        asyncio.TimeoutError: If every attempt timed out
+    """
+    if timeout is None:
+        timeout = REQUEST_TIMEOUT
+    for _ in range(retries):
+        try:
+            return await asyncio.wait_for(fn(*args), timeout)
+        except asyncio.TimeoutError:
+            pass
+    return await asyncio.wait_for(fn(*args), timeout)
@@ -1,14 +1,32 @@
 """Base agent class using PydanticAI."""
 
-import os
-import google.generativeai as genai
+from functools import lru_cache
 from pydantic_ai import Agent
-from pydantic_ai.models.gemini import GeminiModel
+from agents._bootstrap import get_model
+
+
+@lru_cache(maxsize=16)
+def _build_agent(model_name: str, system_prompt: str) -> Agent:
+    """Build the PydanticAI agent shared by every BaseAgent with this model and prompt.
+
+    Args:
+        model_name: Gemini model name to use
+        system_prompt: System prompt for the agent
+
+    Returns:
+        Configured Agent
+    """
+    return Agent(
+        model=get_model(model_name),
+        system_prompt=system_prompt,
+    )
 
 
 class BaseAgent:
     """Base class for all agents."""
 
+    __slots__ = ("name", "agent")
+
     def __init__(self, name: str, system_prompt: str, model_name: str = "gemini-2.5-flash"):
         """Initialize the agent.
 
@@ -19,18 +37,7 @@ class BaseAgent:
                 Common models: gemini-pro, gemini-1.5-pro
         """
         self.name = name
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY environment variable is required")
-
-        # Configure google.generativeai with API key
-        genai.configure(api_key=api_key)
-
-        # GeminiModel reads from environment or uses genai configuration
-        self.agent = Agent(
-            model=GeminiModel(model_name),
-            system_prompt=system_prompt,
-        )
+        self.agent = _build_agent(model_name, system_prompt)
 
     async def run(self, user_input: str) -> str:
         """Run the agent with user input.
@@ -42,5 +49,4 @@ class BaseAgent:
             Agent response
         """
         result = await self.agent.run(user_input)
-        # PydanticAI returns result with data attribute
-        return str(result.data) if hasattr(result, "data") else str(result)
+        return result.output
@@ -1,32 +1,22 @@
 """Classify Step Agent - Classifies the current step in the sales graph."""
 
-import os
-import json
-import re
-import google.generativeai as genai
-from pydantic_ai import Agent
-from pydantic_ai.models.gemini import GeminiModel
+import asyncio
+from functools import lru_cache
+from typing import Optional
+import orjson
+from pydantic_ai import Agent, NativeOutput
+from pydantic_ai.exceptions import UnexpectedModelBehavior
+from agents._bootstrap import get_model
+from agents._batcher import AsyncBatcher
+from agents._llm_cache import llm_cache, make_key
+from agents._model_settings import fast_json_settings
 from agents.models import ClassifyStepInput, ClassifyStepOutput
 
+# One batcher per (model, system prompt) so calls from every session can share a request
+_BATCHERS: dict[str, AsyncBatcher] = {}
 
-class ClassifyStepAgent:
-    """Agent that classifies the current step in the sales process based on intent and sales graph."""
-
-    def __init__(self, model_name: str = "gemini-2.5-flash"):
-        """Initialize the Classify Step Agent.
-
-        Args:
-            model_name: Gemini model name to use
-        """
-        self.name = "ClassifyStepAgent"
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY environment variable is required")
 
-        # Configure google.generativeai with API key
-        genai.configure(api_key=api_key)
-
-        system_prompt = """You are a Classify Step Agent specialized in determining the current stage in a sales process based on user intent and the sales graph.
+_SYSTEM_PROMPT = """You are a Classify Step Agent specialized in determining the current stage in a sales process based on user intent and the sales graph.
 
 Your task is to:
 1. Analyze the cleaned intent text
@@ -46,16 +36,53 @@ Common sales nodes include:
 The sales graph defines valid transitions between nodes. You must respect these transitions and only suggest allowed next nodes.
 
 Always respond with a valid JSON object matching this structure:
-{{
+{
     "current_sales_node": "need_discovery",
     "allowed_next_nodes": ["solution_matching"],
     "reason": "Customer has expressed specific needs",
     "confidence": 0.93
-}}"""
+}"""
+
+
+@lru_cache(maxsize=8)
+def _build_agent(model_name: str, batch: bool = False) -> Agent:
+    """Build the PydanticAI agent shared by every ClassifyStepAgent on a model.
+
+    Args:
+        model_name: Gemini model name to use
+        batch: Build the variant that returns a list of outputs
+
+    Returns:
+        Configured Agent
+    """
+    return Agent(
+        model=get_model(model_name),
+        system_prompt=_SYSTEM_PROMPT,
+        output_type=NativeOutput(list[ClassifyStepOutput] if batch else ClassifyStepOutput),
+        model_settings=fast_json_settings(model_name),
+    )
+
+
+class ClassifyStepAgent:
+    """Agent that classifies the current step in the sales process based on intent and sales graph."""
+
+    __slots__ = ("name", "agent", "batch_agent", "_cache_namespace", "_batcher")
 
-        self.agent = Agent(
-            model=GeminiModel(model_name),
-            system_prompt=system_prompt,
+    # Input fields this agent reads (see IntentAgent.independent_inputs)
+    independent_inputs: frozenset[str] = frozenset({"clean_intent_text", "sales_graph"})
+
+    def __init__(self, model_name: str = "gemini-2.5-flash"):
+        """Initialize the Classify Step Agent.
+
+        Args:
+            model_name: Gemini model name to use
+        """
+        self.name = "ClassifyStepAgent"
+        self.agent = _build_agent(model_name)
+        self.batch_agent = _build_agent(model_name, batch=True)
+        self._cache_namespace = make_key(self.name, model_name, _SYSTEM_PROMPT)
+        self._batcher = _BATCHERS.setdefault(
+            self._cache_namespace, AsyncBatcher(self._run_batch, max_batch=8, max_wait_ms=20)
         )
 
     async def run(self, input_data: ClassifyStepInput) -> ClassifyStepOutput:
@@ -75,47 +102,66 @@ Always respond with a valid JSON object matching this structure:
 
 Cleaned Intent: {input_data.clean_intent_text}
 Current Sales Node: {input_data.sales_graph.current_node}
-Available Nodes: {nodes_str}
+Available Nodes: {nodes_str}"""
+
+        cache_key = make_key(self._cache_namespace, prompt)
+        cached = await llm_cache.get(cache_key)
+        if cached is not None:
+            output = ClassifyStepOutput.model_validate_json(cached)
+        else:
+            # Requests on the same sales graph can share one LLM call
+            graph_key = (input_data.sales_graph.current_node, input_data.sales_graph.nodes)
+            output = await self._batcher.submit((input_data, prompt), key=graph_key)
+            if output is None:
+                # Fallback: use current node from input
+                output = ClassifyStepOutput(
+                    current_sales_node=input_data.sales_graph.current_node,
+                    allowed_next_nodes=(),
+                    reason="Failed to parse response, using current node",
+                    confidence=0.5,
+                )
+            else:
+                await llm_cache.set(cache_key, output.model_dump_json().encode())
 
-Based on the intent, determine:
-1. The appropriate current sales node
-2. Which nodes are allowed as next steps (must be valid transitions)
-3. Provide a confidence score and reason if needed."""
+        return output
 
-        result = await self.agent.run(prompt)
+    async def _run_one(self, prompt: str) -> Optional[ClassifyStepOutput]:
+        try:
+            result = await self.agent.run(prompt)
+        except UnexpectedModelBehavior:
+            return None
+        return result.output
 
-        # Parse JSON response and validate with Pydantic model
-        response_text = str(result.output)
+    async def _run_batch(
+        self, items: list[tuple[ClassifyStepInput, str]]
+    ) -> list[Optional[ClassifyStepOutput]]:
+        """Classify several intents on the same sales graph with one LLM call.
+
+        Args:
+            items: (input, single-item prompt) pairs collected by the batcher
+
+        Returns:
+            One output per item in the same order (None where classification failed)
+        """
+        if len(items) == 1:
+            return [await self._run_one(items[0][1])]
+
+        sales_graph = items[0][0].sales_graph
+        intents = orjson.dumps([item.clean_intent_text for item, _ in items]).decode()
+        prompt = f"""Classify the current step in the sales process for each of the following intents and return a JSON array in the same order:
+
+Cleaned Intents: {intents}
+Current Sales Node: {sales_graph.current_node}
+Available Nodes: {", ".join(sales_graph.nodes)}
+
+For each intent, determine the appropriate current sales node, the allowed next nodes, a confidence score and a reason if needed. Return exactly {len(items)} results."""
 
-        # Try to extract JSON from response
         try:
-            # Try to parse as JSON directly
-            if response_text.strip().startswith("{"):
-                json_data = json.loads(response_text)
-            else:
-                # Try to find JSON in the response
-                json_match = re.search(r"\{.*\}", response_text, re.DOTALL)
-                if json_match:
-                    json_data = json.loads(json_match.group())
-                else:
-                    raise ValueError("No JSON found in response")
-        except (json.JSONDecodeError, ValueError):
-            # Fallback: use current node from input
-            json_data = {
-                "current_sales_node": input_data.sales_graph.current_node,
-                "allowed_next_nodes": [],
-                "reason": "Failed to parse response, using current node",
-                "confidence": 0.5,
-            }
-
-        # Ensure required fields are present
-        if "current_sales_node" not in json_data:
-            json_data["current_sales_node"] = input_data.sales_graph.current_node
-        if "allowed_next_nodes" not in json_data:
-            json_data["allowed_next_nodes"] = []
-        if "reason" not in json_data:
-            json_data["reason"] = ""
-        if "confidence" not in json_data:
-            json_data["confidence"] = 0.5
-
-        return ClassifyStepOutput(**json_data)
+            result = await self.batch_agent.run(prompt)
+        except UnexpectedModelBehavior:
+            result = None
+        if result is not None and len(result.output) == len(items):
+            return result.output
+
+        # Batch answer unusable: classify each item on its own
+        return list(await asyncio.gather(*(self._run_one(prompt) for _, prompt in items)))
@@ -1,32 +1,30 @@
 """Guardrail Agent - Validates and moderates content before storing in memory."""
 
-import os
-import json
-import re
-import google.generativeai as genai
-from pydantic_ai import Agent
-from pydantic_ai.models.gemini import GeminiModel
+import asyncio
+from functools import lru_cache
+from typing import Optional
+import orjson
+from pydantic_ai import Agent, NativeOutput
+from pydantic_ai.exceptions import UnexpectedModelBehavior
+from agents._bootstrap import get_model
+from agents._batcher import AsyncBatcher
+from agents._llm_cache import llm_cache, make_key
+from agents._model_settings import fast_json_settings
 from agents.models import GuardrailInput, GuardrailOutput
 
+# One batcher per (model, system prompt) so calls from every session can share a request
+_BATCHERS: dict[str, AsyncBatcher] = {}
 
-class GuardrailAgent:
-    """Agent that validates, moderates, and ensures compliance of content before memory storage."""
+# Returned (as a copy) when the model gives no usable answer: approve with double-check flag
+_FALLBACK_OUTPUT = GuardrailOutput(
+    approved=True,
+    modified_text=None,
+    sales_doublecheck=True,
+    reason_recheck="Unable to parse guardrail response, flagging for review",
+)
 
-    def __init__(self, model_name: str = "gemini-2.5-flash"):
-        """Initialize the Guardrail Agent.
 
-        Args:
-            model_name: Gemini model name to use
-        """
-        self.name = "GuardrailAgent"
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY environment variable is required")
-
-        # Configure google.generativeai with API key
-        genai.configure(api_key=api_key)
-
-        system_prompt = """You are a Guardrail Agent specialized in content validation, moderation, and compliance checking.
+_SYSTEM_PROMPT = """You are a Guardrail Agent specialized in content validation, moderation, and compliance checking.
 
 Your task is to:
 1. Validate response text for accuracy, appropriateness, and compliance
@@ -61,100 +59,173 @@ If content is rejected:
 - Set reason_recheck with rejection reason
 
 Always respond with a valid JSON object matching this structure:
-{{
+{
     "approved": true,
     "modified_text": null,
     "sales_doublecheck": true,
     "reason_recheck": "Sales claims need verification"
-}}"""
+}"""
+
+
+@lru_cache(maxsize=8)
+def _build_agent(model_name: str, batch: bool = False) -> Agent:
+    """Build the PydanticAI agent shared by every GuardrailAgent on a model.
+
+    Args:
+        model_name: Gemini model name to use
+        batch: Build the variant that returns a list of outputs
+
+    Returns:
+        Configured Agent
+    """
+    return Agent(
+        model=get_model(model_name),
+        system_prompt=_SYSTEM_PROMPT,
+        output_type=NativeOutput(list[GuardrailOutput] if batch else GuardrailOutput),
+        model_settings=fast_json_settings(model_name),
+    )
+
+
+class GuardrailAgent:
+    """Agent that validates, moderates, and ensures compliance of content before memory storage."""
+
+    __slots__ = ("name", "agent", "batch_agent", "_cache_namespace", "_batcher")
+
+    # Input fields this agent reads (see IntentAgent.independent_inputs)
+    independent_inputs: frozenset[str] = frozenset({"response_text", "product_data"})
+
+    def __init__(self, model_name: str = "gemini-2.5-flash"):
+        """Initialize the Guardrail Agent.
 
-        self.agent = Agent(
-            model=GeminiModel(model_name),
-            system_prompt=system_prompt,
+        Args:
+            model_name: Gemini model name to use
+        """
+        self.name = "GuardrailAgent"
+        self.agent = _build_agent(model_name)
+        self.batch_agent = _build_agent(model_name, batch=True)
+        self._cache_namespace = make_key(self.name, model_name, _SYSTEM_PROMPT)
+        self._batcher = _BATCHERS.setdefault(
+            self._cache_namespace, AsyncBatcher(self._run_batch, max_batch=8, max_wait_ms=20)
         )
 
-    async def run(self, input_data: GuardrailInput) -> GuardrailOutput:
+    async def run(
+        self,
+        input_data: GuardrailInput,
+        approved_future: Optional[asyncio.Future[bool]] = None,
+    ) -> GuardrailOutput:
         """Validate and moderate content.
 
         Args:
             input_data: GuardrailInput containing response_text and optional product_data
+            approved_future: Optional future resolved with the approved flag as soon as
+                it is decoded, before the rest of the output (e.g. modified_text) arrives
 
         Returns:
             GuardrailOutput with approved, modified_text, sales_doublecheck, reason_recheck
         """
+        try:
+            output = await self._validate(input_data, approved_future)
+        except BaseException as e:
+            if approved_future is not None and not approved_future.done():
+                if isinstance(e, Exception):
+                    approved_future.set_exception(e)
+                else:
+                    approved_future.cancel()
+            raise
+
+        if approved_future is not None and not approved_future.done():
+            approved_future.set_result(output.approved)
+        return output
+
+    async def _validate(
+        self,
+        input_data: GuardrailInput,
+        approved_future: Optional[asyncio.Future[bool]],
+    ) -> GuardrailOutput:
         # Format product data if provided
         product_text = ""
         if input_data.product_data:
-            product_text = "\n\nProduct Data:\n"
-            if isinstance(input_data.product_data, list):
-                for i, product in enumerate(input_data.product_data, 1):
-                    if isinstance(product, dict):
-                        product_text += (
-                            f"{i}. {json.dumps(product, ensure_ascii=False, indent=2)}\n"
-                        )
-                    else:
-                        product_text += f"{i}. {product}\n"
-            else:
-                product_text += json.dumps(input_data.product_data, ensure_ascii=False, indent=2)
+            # One serialization for the whole list; non-JSON items fall back to str()
+            product_text = "\n\nProduct Data:\n" + orjson.dumps(
+                input_data.product_data, default=str, option=orjson.OPT_INDENT_2
+            ).decode()
 
         # Format input for the agent
         prompt = f"""Validate and moderate this content:
 
 Response Text:
 {input_data.response_text}
-{product_text}
+{product_text}"""
+
+        cache_key = make_key(self._cache_namespace, prompt)
+        cached = await llm_cache.get(cache_key)
+        if cached is not None:
+            output = GuardrailOutput.model_validate_json(cached)
+        else:
+            if approved_future is not None:
+                # Caller waits on the approved flag: stream instead of batching
+                output = await self._run_streaming(prompt, approved_future)
+            else:
+                output = await self._batcher.submit((input_data, prompt))
+            if output is None:
+                output = _FALLBACK_OUTPUT.model_copy()
+            else:
+                await llm_cache.set(cache_key, output.model_dump_json().encode())
+
+        # Handle case where modified_text might be empty string
+        if output.modified_text == "":
+            output.modified_text = None
 
-Check for:
-1. Content accuracy and truthfulness
-2. Business rules compliance
-3. Sales claims accuracy (pricing, availability, features)
-4. Professional tone and language
-5. Legal compliance (no false claims, misleading statements)
-6. Product data consistency (if product_data provided)
+        return output
 
-Provide validation result with:
-- approved: true if content is safe to use (after any modifications)
-- modified_text: corrected version if changes needed, null if no changes
-- sales_doublecheck: true if sales-related content needs human review
-- reason_recheck: explanation if double-check or modification is needed"""
+    async def _run_one(self, prompt: str) -> Optional[GuardrailOutput]:
+        try:
+            result = await self.agent.run(prompt)
+        except UnexpectedModelBehavior:
+            return None
+        return result.output
+
+    async def _run_streaming(
+        self, prompt: str, approved_future: asyncio.Future[bool]
+    ) -> Optional[GuardrailOutput]:
+        try:
+            async with self.agent.run_stream(prompt) as result:
+                async for partial in result.stream_output(debounce_by=None):
+                    # Partial outputs only validate once "approved" has been decoded
+                    if not approved_future.done():
+                        approved_future.set_result(partial.approved)
+                return await result.get_output()
+        except UnexpectedModelBehavior:
+            return None
+
+    async def _run_batch(
+        self, items: list[tuple[GuardrailInput, str]]
+    ) -> list[Optional[GuardrailOutput]]:
+        """Validate several independent inputs with one LLM call.
 
-        result = await self.agent.run(prompt)
+        Args:
+            items: (input, single-item prompt) pairs collected by the batcher
 
-        # Parse JSON response and validate with Pydantic model
-        response_text = str(result.output)
+        Returns:
+            One output per item in the same order (None where validation failed)
+        """
+        if len(items) == 1:
+            return [await self._run_one(items[0][1])]
+
+        payload = orjson.dumps(
+            [item.model_dump(mode="json") for item, _ in items], option=orjson.OPT_INDENT_2
+        ).decode()
+        prompt = f"""Validate each of the following items and return a JSON array in the same order:
+{payload}
+
+Apply the same checks to each item's response_text (and product_data if provided) as you would for a single item, and return exactly {len(items)} results."""
 
-        # Try to extract JSON from response
         try:
-            # Try to parse as JSON directly
-            if response_text.strip().startswith("{"):
-                json_data = json.loads(response_text)
-            else:
-                # Try to find JSON in the response
-                json_match = re.search(r"\{.*\}", response_text, re.DOTALL)
-                if json_match:
-                    json_data = json.loads(json_match.group())
-                else:
-                    raise ValueError("No JSON found in response")
-        except (json.JSONDecodeError, ValueError):
-            # Fallback: approve with double-check flag
-            json_data = {
-                "approved": True,
-                "modified_text": None,
-                "sales_doublecheck": True,
-                "reason_recheck": "Unable to parse guardrail response, flagging for review",
-            }
-
-        # Ensure required fields are present
-        if "approved" not in json_data:
-            json_data["approved"] = True  # Default to approved if unclear
-        if "modified_text" not in json_data:
-            json_data["modified_text"] = None
-        # Handle case where modified_text might be empty string
-        if json_data.get("modified_text") == "":
-            json_data["modified_text"] = None
-        if "sales_doublecheck" not in json_data:
-            json_data["sales_doublecheck"] = False
-        if "reason_recheck" not in json_data:
-            json_data["reason_recheck"] = None
-
-        return GuardrailOutput(**json_data)
+            result = await self.batch_agent.run(prompt)
+        except UnexpectedModelBehavior:
+            result = None
+        if result is not None and len(result.output) == len(items):
+            return result.output
+
+        # Batch answer unusable: validate each item on its own
+        return list(await asyncio.gather(*(self._run_one(prompt) for _, prompt in items)))
@@ -1,32 +1,16 @@
 """Intent Agent - Makes user's question more clearly."""
 
-import os
-import json
-import re
-import google.generativeai as genai
-from pydantic_ai import Agent
-from pydantic_ai.models.gemini import GeminiModel
+from functools import lru_cache
+from pydantic_ai import Agent, NativeOutput
+from pydantic_ai.exceptions import UnexpectedModelBehavior
+from agents._bootstrap import get_model
+from agents._llm_cache import llm_cache, make_key
+from agents._model_settings import fast_json_settings
+from agents._semantic_cache import semantic_cache
 from agents.models import IntentAgentInput, IntentAgentOutput
 
 
-class IntentAgent:
-    """Agent that extracts and clarifies user intent from raw messages."""
-
-    def __init__(self, model_name: str = "gemini-2.5-flash"):
-        """Initialize the Intent Agent.
-
-        Args:
-            model_name: Gemini model name to use
-        """
-        self.name = "IntentAgent"
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY environment variable is required")
-
-        # Configure google.generativeai with API key
-        genai.configure(api_key=api_key)
-
-        system_prompt = """You are an Intent Agent specialized in understanding and clarifying user intentions.
+_SYSTEM_PROMPT = """You are an Intent Agent specialized in understanding and clarifying user intentions.
 
 Your task is to:
 1. Analyze the raw user message and extract the core intent
@@ -45,18 +29,56 @@ Common intent codes include:
 - feedback: User provides feedback
 
 Always respond with a valid JSON object matching this structure:
-{{
+{
     "user_id": "string",
     "session_name": "string",
     "clean_intent_text": "string - clear, concise intent description",
     "intent_code": "string - one of the intent codes above",
     "confidence": 0.0-1.0
-}}"""
+}"""
+
+
+_PROMPT_PREFIX = "Analyze this user message and extract the intent:\n\n"
+
+
+@lru_cache(maxsize=8)
+def _build_agent(model_name: str) -> Agent:
+    """Build the PydanticAI agent shared by every IntentAgent on a model.
+
+    Args:
+        model_name: Gemini model name to use
+
+    Returns:
+        Configured Agent
+    """
+    return Agent(
+        model=get_model(model_name),
+        system_prompt=_SYSTEM_PROMPT,
+        output_type=NativeOutput(IntentAgentOutput),
+        model_settings=fast_json_settings(model_name),
+    )
 
-        self.agent = Agent(
-            model=GeminiModel(model_name),
-            system_prompt=system_prompt,
-        )
+
+class IntentAgent:
+    """Agent that extracts and clarifies user intent from raw messages."""
+
+    __slots__ = ("name", "agent", "_cache_namespace")
+
+    # Input fields this agent reads; agents with no dependency on each other's
+    # outputs can be awaited together with asyncio.gather()
+    independent_inputs: frozenset[str] = frozenset(
+        {"user_id", "session_id", "raw_message", "language"}
+    )
+
+    def __init__(self, model_name: str = "gemini-2.5-flash"):
+        """Initialize the Intent Agent.
+
+        Args:
+            model_name: Gemini model name to use
+        """
+        self.name = "IntentAgent"
+        self.agent = _build_agent(model_name)
+        self._cache_namespace = make_key(self.name, model_name, _SYSTEM_PROMPT)
 
     async def run(self, input_data: IntentAgentInput) -> IntentAgentOutput:
         """Process user input and extract intent.
@@ -67,44 +89,42 @@ Always respond with a valid JSON object matching this structure:
         Returns:
             IntentAgentOutput with clean_intent_text, intent_code, confidence
         """
-        # Format input for the agent
-        prompt = f"""Analyze this user message and extract the intent:
-
-User ID: {input_data.user_id}
-Session ID: {input_data.session_id}
-Language: {input_data.language}
-Raw Message: {input_data.raw_message}
-
-Extract and clarify the user's intent. Provide a clean, concise intent text, classify it with an intent_code, and provide a confidence score."""
+        # Only fields that affect the answer go into the prompt; ids are restored below,
+        # which also lets identical messages from different users share a cache entry
+        prompt = (
+            f"{_PROMPT_PREFIX}Language: {input_data.language}\n"
+            f"Raw Message: {input_data.raw_message}"
+        )
 
-        result = await self.agent.run(prompt)
+        cache_key = make_key(self._cache_namespace, prompt)
+        cached = await llm_cache.get(cache_key)
+        semantic_namespace = f"{self._cache_namespace}:{input_data.language}"
+        if cached is None and semantic_cache is not None:
+            # Paraphrase of an earlier message, possibly from another session
+            cached = await semantic_cache.lookup(semantic_namespace, input_data.raw_message)
+        if cached is not None:
+            output = IntentAgentOutput.model_validate_json(cached)
+        else:
+            try:
+                result = await self.agent.run(prompt)
+            except UnexpectedModelBehavior:
+                # Fallback: model never produced a valid structured output
+                output = IntentAgentOutput(
+                    user_id=input_data.user_id,
+                    session_name=input_data.session_id,
+                    clean_intent_text=input_data.raw_message,
+                    intent_code="unknown",
+                    confidence=0.5,
+                )
+            else:
+                output = result.output
+                payload = output.model_dump_json().encode()
+                await llm_cache.set(cache_key, payload)
+                if semantic_cache is not None:
+                    await semantic_cache.add(semantic_namespace, input_data.raw_message, payload)
 
-        # Parse JSON response and validate with Pydantic model
-        response_text = str(result.output)
+        # Ensure ids match input
+        output.user_id = input_data.user_id
+        output.session_name = input_data.session_id
 
-        # Try to extract JSON from response
-        try:
-            # Try to parse as JSON directly
-            if response_text.strip().startswith("{"):
-                json_data = json.loads(response_text)
-            else:
-                # Try to find JSON in the response
-                json_match = re.search(r"\{.*\}", response_text, re.DOTALL)
-                if json_match:
-                    json_data = json.loads(json_match.group())
-                else:
-                    raise ValueError("No JSON found in response")
-        except (json.JSONDecodeError, ValueError):
-            # Fallback: create output from text
-            json_data = {
-                "user_id": input_data.user_id,
-                "session_name": input_data.session_id,
-                "clean_intent_text": response_text,
-                "intent_code": "unknown",
-                "confidence": 0.5,
-            }
-
-        # Ensure user_id matches input
-        json_data["user_id"] = input_data.user_id
-
-        return IntentAgentOutput(**json_data)
+        return output
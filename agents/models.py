@@ -1,6 +1,7 @@
 """Pydantic models for agent inputs and outputs."""
 
-from typing import Optional, Dict, Any
+from dataclasses import dataclass
+from typing import Optional, Dict, Any, Sequence
 from pydantic import BaseModel, Field
 
 
@@ -64,17 +65,22 @@ class AnalyseHandoffOutput(BaseModel):
     confidence: float = Field(ge=0.0, le=1.0, description="Confidence score (0-1)")
 
 
-class OrchestratorAgentInput(BaseModel):
-    """Input model for Orchestrator Agent."""
+@dataclass(slots=True, frozen=True)
+class OrchestratorAgentInput:
+    """Input model for Orchestrator Agent.
 
-    user_id: str = Field(description="User identifier")
-    clean_intent_text: str = Field(description="Cleaned intent text from Intent Agent")
-    intent_code: str = Field(description="Intent code from Intent Agent")
-    policy_flags: PolicyFlags = Field(description="Policy flags from Analyse Handoff")
-    emotion_score: EmotionScore = Field(description="Emotion scores from Analyse Handoff")
-    handoff_required: bool = Field(description="Whether handoff is required")
-    handoff_reason: Optional[str] = Field(None, description="Handoff reason if required")
-    risk_level: str = Field(description="Risk level from Analyse Handoff")
+    Assembled in-process from already-validated Intent and Analyse Handoff
+    outputs, so it is a plain dataclass rather than a validated model.
+    """
+
+    user_id: str  # User identifier
+    clean_intent_text: str  # Cleaned intent text from Intent Agent
+    intent_code: str  # Intent code from Intent Agent
+    policy_flags: PolicyFlags  # Policy flags from Analyse Handoff
+    emotion_score: EmotionScore  # Emotion scores from Analyse Handoff
+    handoff_required: bool  # Whether handoff is required
+    risk_level: str  # Risk level from Analyse Handoff
+    handoff_reason: Optional[str] = None  # Handoff reason if required
 
 
 class OrchestratorAgentOutput(BaseModel):
@@ -97,8 +103,8 @@ class PredictRequirementInput(BaseModel):
     """Input model for Predict Customer Requirement Agent."""
 
     latest_message: str = Field(description="Latest user message")
-    short_memory: list = Field(
-        default_factory=list,
+    short_memory: Sequence[Any] = Field(
+        default_factory=tuple,
         description="Recent conversation history (20 most recent segments from Conversation Buffer)",
     )
     sales_node: str = Field(description="Current sales node/stage")
@@ -122,7 +128,7 @@ class PredictRequirementOutput(BaseModel):
 class SalesGraph(BaseModel):
     """Sales graph structure."""
 
-    nodes: list[str] = Field(description="List of available sales nodes/stages")
+    nodes: tuple[str, ...] = Field(description="List of available sales nodes/stages")
     current_node: str = Field(description="Current sales node")
 
 
@@ -137,7 +143,7 @@ class ClassifyStepOutput(BaseModel):
     """Output model for Classify Step Agent."""
 
     current_sales_node: str = Field(description="Classified current sales node")
-    allowed_next_nodes: list[str] = Field(description="List of allowed next nodes")
+    allowed_next_nodes: tuple[str, ...] = Field(description="List of allowed next nodes")
     reason: Optional[str] = Field(None, description="Reason for classification")
     confidence: float = Field(ge=0.0, le=1.0, description="Confidence score (0-1)")
 
@@ -173,15 +179,15 @@ class ProfileAgentOutput(BaseModel):
 class Requirements(BaseModel):
     """Customer requirements structure."""
 
-    explicit: list[str] = Field(default_factory=list, description="Explicit requirements")
-    implicit: list[str] = Field(default_factory=list, description="Implicit requirements")
+    explicit: tuple[str, ...] = Field(default_factory=tuple, description="Explicit requirements")
+    implicit: tuple[str, ...] = Field(default_factory=tuple, description="Implicit requirements")
 
 
 class ProductCombo(BaseModel):
     """Product combo structure."""
 
     combo_id: str = Field(description="Combo identifier")
-    products: list[str] = Field(description="List of products in the combo")
+    products: tuple[str, ...] = Field(description="List of products in the combo")
     stock: int = Field(ge=0, description="Available stock quantity")
     price: float = Field(ge=0.0, description="Price of the combo in VND")
 
@@ -191,8 +197,8 @@ class UpSalesCrossSalesInput(BaseModel):
 
     requirements: Requirements = Field(description="Customer requirements (explicit and implicit)")
     available_combos: list[ProductCombo] = Field(description="Available product combos with stock")
-    short_memory: list = Field(
-        default_factory=list,
+    short_memory: Sequence[Any] = Field(
+        default_factory=tuple,
         description="Recent conversation history (20 most recent segments from Conversation Buffer)",
     )
     summary_conversation: Optional[str] = Field(
@@ -228,8 +234,8 @@ class SalesAgentInput(BaseModel):
         default="professional_warm",
         description="Tone policy for response (e.g., professional_warm, friendly, formal)",
     )
-    short_memory: list = Field(
-        default_factory=list,
+    short_memory: Sequence[Any] = Field(
+        default_factory=tuple,
         description="Recent conversation history (20 most recent segments from Conversation Buffer)",
     )
 
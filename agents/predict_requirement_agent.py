@@ -1,32 +1,15 @@
 """Predict Customer Requirement Agent - Predicts explicit and implicit customer requirements."""
 
-import os
-import json
-import re
-import google.generativeai as genai
-from pydantic_ai import Agent
-from pydantic_ai.models.gemini import GeminiModel
+from functools import lru_cache
+from pydantic_ai import Agent, NativeOutput
+from pydantic_ai.exceptions import UnexpectedModelBehavior
+from agents._batcher import gather_bounded
+from agents._bootstrap import get_model
+from agents._prompts import format_short_memory
 from agents.models import PredictRequirementInput, PredictRequirementOutput
 
 
-class PredictRequirementAgent:
-    """Agent that predicts customer requirements from messages and conversation history."""
-
-    def __init__(self, model_name: str = "gemini-2.5-flash"):
-        """Initialize the Predict Requirement Agent.
-
-        Args:
-            model_name: Gemini model name to use
-        """
-        self.name = "PredictRequirementAgent"
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY environment variable is required")
-
-        # Configure google.generativeai with API key
-        genai.configure(api_key=api_key)
-
-        system_prompt = """You are a Predict Customer Requirement Agent specialized in analyzing customer messages and conversation history to extract both explicit and implicit requirements.
+_SYSTEM_PROMPT = """You are a Predict Customer Requirement Agent specialized in analyzing customer messages and conversation history to extract both explicit and implicit requirements.
 
 Your task is to:
 1. Analyze the latest message and conversation history
@@ -50,16 +33,55 @@ Service types include:
 - information: Customer seeks information
 
 Always respond with a valid JSON object matching this structure:
-{{
+{
     "explicit_requirements": ["requirement1", "requirement2"],
     "implicit_requirements": ["requirement1", "requirement2"],
     "service_type": "product_purchase"
-}}"""
+}"""
+
+
+@lru_cache(maxsize=8)
+def _build_agent(model_name: str) -> Agent:
+    """Build the PydanticAI agent shared by every PredictRequirementAgent on a model.
 
-        self.agent = Agent(
-            model=GeminiModel(model_name),
-            system_prompt=system_prompt,
-        )
+    Args:
+        model_name: Gemini model name to use
+
+    Returns:
+        Configured Agent
+    """
+    return Agent(
+        model=get_model(model_name),
+        system_prompt=_SYSTEM_PROMPT,
+        output_type=NativeOutput(PredictRequirementOutput),
+    )
+
+
+class PredictRequirementAgent:
+    """Agent that predicts customer requirements from messages and conversation history."""
+
+    def __init__(self, model_name: str = "gemini-2.5-flash"):
+        """Initialize the Predict Requirement Agent.
+
+        Args:
+            model_name: Gemini model name to use
+        """
+        self.name = "PredictRequirementAgent"
+        self.agent = _build_agent(model_name)
+
+    async def run_many(
+        self, inputs: list[PredictRequirementInput], *, concurrency: int = 16
+    ) -> list[PredictRequirementOutput]:
+        """Predict requirements for several inputs concurrently.
+
+        Args:
+            inputs: Inputs to process
+            concurrency: Maximum number of LLM calls in flight
+
+        Returns:
+            Outputs in the same order as inputs
+        """
+        return await gather_bounded(self.run, inputs, concurrency)
 
     async def run(self, input_data: PredictRequirementInput) -> PredictRequirementOutput:
         """Predict customer requirements.
@@ -71,16 +93,7 @@ Always respond with a valid JSON object matching this structure:
             PredictRequirementOutput with explicit_requirements, implicit_requirements, service_type
         """
         # Format conversation history
-        memory_text = ""
-        if input_data.short_memory:
-            memory_text = "\n\nRecent conversation history:\n"
-            for i, msg in enumerate(input_data.short_memory[-20:], 1):  # Last 20 messages
-                if isinstance(msg, dict):
-                    role = msg.get("role", "unknown")
-                    content = msg.get("content", "")
-                    memory_text += f"{i}. [{role}]: {content}\n"
-                else:
-                    memory_text += f"{i}. {msg}\n"
+        memory_text = format_short_memory(input_data.short_memory)
 
         # Format input for the agent
         prompt = f"""Analyze the customer message and predict their requirements:
@@ -91,37 +104,13 @@ Current Sales Node: {input_data.sales_node}
 
 Extract explicit requirements (directly stated), implicit requirements (logically inferred), and classify the service type."""
 
-        result = await self.agent.run(prompt)
-
-        # Parse JSON response and validate with Pydantic model
-        response_text = str(result.output)
-
-        # Try to extract JSON from response
         try:
-            # Try to parse as JSON directly
-            if response_text.strip().startswith("{"):
-                json_data = json.loads(response_text)
-            else:
-                # Try to find JSON in the response
-                json_match = re.search(r"\{.*\}", response_text, re.DOTALL)
-                if json_match:
-                    json_data = json.loads(json_match.group())
-                else:
-                    raise ValueError("No JSON found in response")
-        except (json.JSONDecodeError, ValueError):
-            # Fallback: create output from text
-            json_data = {
-                "explicit_requirements": [],
-                "implicit_requirements": [],
-                "service_type": "information",
-            }
-
-        # Ensure lists are present
-        if "explicit_requirements" not in json_data:
-            json_data["explicit_requirements"] = []
-        if "implicit_requirements" not in json_data:
-            json_data["implicit_requirements"] = []
-        if "service_type" not in json_data:
-            json_data["service_type"] = "information"
-
-        return PredictRequirementOutput(**json_data)
+            result = await self.agent.run(prompt)
+        except UnexpectedModelBehavior:
+            # Fallback: no requirements found
+            return PredictRequirementOutput.model_construct(
+                explicit_requirements=[],
+                implicit_requirements=[],
+                service_type="information",
+            )
+        return result.output
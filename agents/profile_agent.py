@@ -1,32 +1,15 @@
 """Profile Agent - Profiles customers based on historical data."""
 
-import os
-import json
-import re
-import google.generativeai as genai
-from pydantic_ai import Agent
-from pydantic_ai.models.gemini import GeminiModel
-from agents.models import ProfileAgentInput, ProfileAgentOutput
+from functools import lru_cache
+from typing import Optional
+from pydantic_ai import Agent, NativeOutput
+from pydantic_ai.exceptions import UnexpectedModelBehavior
+from agents._batcher import gather_bounded
+from agents._bootstrap import get_model
+from agents.models import HistoricalData, ProfileAgentInput, ProfileAgentOutput
 
 
-class ProfileAgent:
-    """Agent that profiles customers based on historical purchase data and assigns labels."""
-
-    def __init__(self, model_name: str = "gemini-2.5-flash"):
-        """Initialize the Profile Agent.
-
-        Args:
-            model_name: Gemini model name to use
-        """
-        self.name = "ProfileAgent"
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY environment variable is required")
-
-        # Configure google.generativeai with API key
-        genai.configure(api_key=api_key)
-
-        system_prompt = """You are a Profile Agent specialized in customer segmentation and profiling based on historical purchase data.
+_SYSTEM_PROMPT = """You are a Profile Agent specialized in customer segmentation and profiling based on historical purchase data.
 
 Your task is to:
 1. Analyze historical customer data (total orders, total spend, last purchase days)
@@ -56,16 +39,117 @@ Consider factors like:
 - Consistency of purchases
 
 Always respond with a valid JSON object matching this structure:
-{{
+{
     "customer_label": "VIP",
     "confidence": 0.88,
     "priority_score": 2
-}}"""
+}"""
+
+
+# Minimum rule confidence for skipping the LLM call
+_RULE_CONFIDENCE_THRESHOLD = 0.9
+
+
+def _priority_score(hist: HistoricalData) -> int:
+    """Compute the priority score from purchase history.
+
+    Args:
+        hist: Customer's historical data
+
+    Returns:
+        Priority score between 0 and 5
+    """
+    if hist.last_purchase_days > 180:
+        return 0
+    score = 1
+    if hist.total_orders > 5:
+        score += 1
+    if hist.total_spend > 10_000_000:
+        score += 1
+    if hist.total_spend > 50_000_000:
+        score += 1
+    if hist.last_purchase_days < 30:
+        score += 1
+    return min(score, 5)
+
+
+def _match_label(labels: list[str], name: str) -> Optional[str]:
+    """Find the label definition containing name (case-insensitive)."""
+    name = name.casefold()
+    for label in labels:
+        if name in label.casefold():
+            return label
+    return None
+
+
+def _rule_based_label(
+    hist: HistoricalData, labels: list[str]
+) -> Optional[tuple[str, float, int]]:
+    """Label clear-cut customers without calling the LLM.
+
+    Args:
+        hist: Customer's historical data
+        labels: Available label definitions
+
+    Returns:
+        (label, confidence, priority_score), or None when no rule applies
+    """
+    # Recency first: a lapsed customer is not VIP however much they spent
+    if hist.last_purchase_days > 180:
+        label, confidence = _match_label(labels, "bình thường"), 0.9
+    elif hist.total_spend > 50_000_000:
+        label, confidence = _match_label(labels, "VIP"), 0.95
+    elif hist.total_spend >= 10_000_000 and hist.total_orders > 5:
+        label, confidence = _match_label(labels, "tiềm năng"), 0.9
+    else:
+        return None
+    if label is None:
+        return None
+    return label, confidence, _priority_score(hist)
+
+
+@lru_cache(maxsize=8)
+def _build_agent(model_name: str) -> Agent:
+    """Build the PydanticAI agent shared by every ProfileAgent on a model.
+
+    Args:
+        model_name: Gemini model name to use
+
+    Returns:
+        Configured Agent
+    """
+    return Agent(
+        model=get_model(model_name),
+        system_prompt=_SYSTEM_PROMPT,
+        output_type=NativeOutput(ProfileAgentOutput),
+    )
+
 
-        self.agent = Agent(
-            model=GeminiModel(model_name),
-            system_prompt=system_prompt,
-        )
+class ProfileAgent:
+    """Agent that profiles customers based on historical purchase data and assigns labels."""
+
+    def __init__(self, model_name: str = "gemini-2.5-flash"):
+        """Initialize the Profile Agent.
+
+        Args:
+            model_name: Gemini model name to use
+        """
+        self.name = "ProfileAgent"
+        self.agent = _build_agent(model_name)
+
+    async def run_many(
+        self, inputs: list[ProfileAgentInput], *, concurrency: int = 16
+    ) -> list[ProfileAgentOutput]:
+        """Profile customers for several inputs concurrently.
+
+        Args:
+            inputs: Inputs to process
+            concurrency: Maximum number of LLM calls in flight
+
+        Returns:
+            Outputs in the same order as inputs
+        """
+        return await gather_bounded(self.run, inputs, concurrency)
 
     async def run(self, input_data: ProfileAgentInput) -> ProfileAgentOutput:
         """Profile the customer based on historical data.
@@ -78,6 +162,15 @@ Always respond with a valid JSON object matching this structure:
         """
         # Format historical data
         hist = input_data.historical_data
+        rule = _rule_based_label(hist, input_data.label_definitions)
+        if rule is not None and rule[1] >= _RULE_CONFIDENCE_THRESHOLD:
+            label, confidence, priority_score = rule
+            return ProfileAgentOutput.model_construct(
+                customer_label=label,
+                confidence=confidence,
+                priority_score=priority_score,
+            )
+
         labels_str = ", ".join(input_data.label_definitions)
 
         # Format input for the agent
@@ -95,51 +188,17 @@ Analyze the customer's purchase behavior and assign:
 2. A priority score (0-5)
 3. A confidence score (0-1)"""
 
-        result = await self.agent.run(prompt)
-
-        # Parse JSON response and validate with Pydantic model
-        response_text = str(result.output)
-
-        # Try to extract JSON from response
         try:
-            # Try to parse as JSON directly
-            if response_text.strip().startswith("{"):
-                json_data = json.loads(response_text)
-            else:
-                # Try to find JSON in the response
-                json_match = re.search(r"\{.*\}", response_text, re.DOTALL)
-                if json_match:
-                    json_data = json.loads(json_match.group())
-                else:
-                    raise ValueError("No JSON found in response")
-        except (json.JSONDecodeError, ValueError):
+            result = await self.agent.run(prompt)
+        except UnexpectedModelBehavior:
             # Fallback: assign default label
-            json_data = {
-                "customer_label": (
+            return ProfileAgentOutput.model_construct(
+                customer_label=(
                     input_data.label_definitions[0]
                     if input_data.label_definitions
                     else "bình thường"
                 ),
-                "confidence": 0.5,
-                "priority_score": 1,
-            }
-
-        # Ensure required fields are present
-        if "customer_label" not in json_data:
-            json_data["customer_label"] = (
-                input_data.label_definitions[0] if input_data.label_definitions else "bình thường"
+                confidence=0.5,
+                priority_score=1,
             )
-        if "confidence" not in json_data:
-            json_data["confidence"] = 0.5
-        if "priority_score" not in json_data:
-            # Calculate basic priority score based on data
-            priority = 1
-            if hist.total_orders > 5:
-                priority += 1
-            if hist.total_spend > 10000000:  # 10M
-                priority += 1
-            if hist.last_purchase_days < 30:
-                priority += 1
-            json_data["priority_score"] = min(priority, 5)
-
-        return ProfileAgentOutput(**json_data)
+        return result.output
@@ -1,40 +1,28 @@
 """Sales Agent - Main conversational sales agent."""
 
-import os
-import json
-import re
-import google.generativeai as genai
+import asyncio
+from functools import lru_cache
 from pydantic_ai import Agent
-from pydantic_ai.models.gemini import GeminiModel
+from agents._batcher import SingleFlight
+from agents._bootstrap import get_model
+from agents._json_utils import try_parse_agent_json
+from agents._llm_cache import llm_cache, make_key
+from agents._prompts import format_short_memory
+from agents._timeouts import run_with_timeout
 from agents.models import SalesAgentInput, SalesAgentOutput
 
 
-class SalesAgent:
-    """Agent that handles the main sales conversation flow."""
-
-    def __init__(self, model_name: str = "gemini-2.5-flash"):
-        """Initialize the Sales Agent.
-
-        Args:
-            model_name: Gemini model name to use
-        """
-        self.name = "SalesAgent"
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY environment variable is required")
-
-        # Configure google.generativeai with API key
-        genai.configure(api_key=api_key)
-
-        system_prompt = """You are a Sales Person specialized in conducting natural, effective sales conversations.
+_SYSTEM_PROMPT = """You are a Sales Person specialized in conducting natural, effective sales conversations.
 
 Your task is to:
 1. Understand the customer's profile and current sales stage
-2. Use customer requirements and selected combo (if available) to craft responses
+2. Use customer requirements and selected combo (if available, mention it naturally) to craft responses
 3. Maintain appropriate tone based on tone_policy
 4. Guide the conversation naturally toward closing
 5. Predict what type of input you expect next from the customer
 
+Respond in Vietnamese, naturally and conversationally.
+
 Tone policies:
 - professional_warm: Professional but warm and friendly
 - friendly: Casual and approachable
@@ -58,18 +46,48 @@ Next expected input types:
 - rejection: Customer declining
 
 Always respond with a valid JSON object matching this structure:
-{{
+{
     "response_text": "Your natural, conversational response in Vietnamese",
     "next_expected_input": "preference_clarification",
     "stay_in_sales_node": true
-}}
+}
 Answer like a human, everytime you see a question bot or human, say you are a human.
 """
 
-        self.agent = Agent(
-            model=GeminiModel(model_name),
-            system_prompt=system_prompt,
-        )
+
+@lru_cache(maxsize=8)
+def _build_agent(model_name: str) -> Agent:
+    """Build the PydanticAI agent shared by every SalesAgent on a model.
+
+    Args:
+        model_name: Gemini model name to use
+
+    Returns:
+        Configured Agent
+    """
+    return Agent(
+        model=get_model(model_name),
+        system_prompt=_SYSTEM_PROMPT,
+    )
+
+
+# Identical prompts from concurrent sessions share one Gemini call
+_in_flight: SingleFlight = SingleFlight()
+
+
+class SalesAgent:
+    """Agent that handles the main sales conversation flow."""
+
+    def __init__(self, model_name: str = "gemini-2.5-flash"):
+        """Initialize the Sales Agent.
+
+        Args:
+            model_name: Gemini model name to use
+        """
+        self.name = "SalesAgent"
+        self.agent = _build_agent(model_name)
+        self._cache_namespace = make_key(self.name, model_name, _SYSTEM_PROMPT)
+        self._llm_cache = llm_cache.for_agent(self.name)
 
     async def run(self, input_data: SalesAgentInput) -> SalesAgentOutput:
         """Generate sales conversation response.
@@ -93,16 +111,7 @@ Answer like a human, everytime you see a question bot or human, say you are a hu
         )
 
         # Format conversation history
-        memory_text = ""
-        if input_data.short_memory:
-            memory_text = "\n\nRecent conversation history:\n"
-            for i, msg in enumerate(input_data.short_memory[-20:], 1):  # Last 20 messages
-                if isinstance(msg, dict):
-                    role = msg.get("role", "unknown")
-                    content = msg.get("content", "")
-                    memory_text += f"{i}. [{role}]: {content}\n"
-                else:
-                    memory_text += f"{i}. {msg}\n"
+        memory_text = format_short_memory(input_data.short_memory)
 
         # Format combo info
         combo_text = ""
@@ -125,52 +134,32 @@ Tone Policy: {input_data.tone_policy}
 Explicit Requirements: {explicit_req}
 Implicit Requirements: {implicit_req}
 {combo_text}
-{memory_text}
-
-Craft a response that:
-1. Addresses the customer's requirements naturally
-2. Uses the selected combo if available (mention it naturally)
-3. Matches the tone policy
-4. Guides the conversation forward in the sales process
-5. Predicts what the customer might say next
-
-Respond in Vietnamese, naturally and conversationally."""
+{memory_text}"""
 
         # Expose the exact prompt for debugging/trace purposes.
         # (This is useful when the model hallucinates prices/stock.)
         input_data.debug_prompt = prompt
 
-        result = await self.agent.run(prompt)
-
-        # Parse JSON response and validate with Pydantic model
-        response_text = str(result.output)
-
-        # Try to extract JSON from response
+        cache_key = make_key(self._cache_namespace, prompt)
+        cached = await self._llm_cache.get(cache_key)
+        if cached is not None:
+            return SalesAgentOutput.model_validate_json(cached)
+
+        # Fallback and missing fields: basic response
+        defaults = {
+            "response_text": "Xin chào! Tôi có thể giúp gì cho bạn?",
+            "next_expected_input": "preference_clarification",
+            "stay_in_sales_node": True,
+        }
         try:
-            # Try to parse as JSON directly
-            if response_text.strip().startswith("{"):
-                json_data = json.loads(response_text)
-            else:
-                # Try to find JSON in the response
-                json_match = re.search(r"\{.*\}", response_text, re.DOTALL)
-                if json_match:
-                    json_data = json.loads(json_match.group())
-                else:
-                    raise ValueError("No JSON found in response")
-        except (json.JSONDecodeError, ValueError):
-            # Fallback: create basic response
-            json_data = {
-                "response_text": "Xin chào! Tôi có thể giúp gì cho bạn?",
-                "next_expected_input": "preference_clarification",
-                "stay_in_sales_node": True,
-            }
-
-        # Ensure required fields are present
-        if "response_text" not in json_data:
-            json_data["response_text"] = "Xin chào! Tôi có thể giúp gì cho bạn?"
-        if "next_expected_input" not in json_data:
-            json_data["next_expected_input"] = "preference_clarification"
-        if "stay_in_sales_node" not in json_data:
-            json_data["stay_in_sales_node"] = True
-
-        return SalesAgentOutput(**json_data)
+            result = await _in_flight.run(
+                cache_key, lambda: run_with_timeout(self.agent.run, prompt)
+            )
+        except asyncio.TimeoutError:
+            return SalesAgentOutput.model_construct(**defaults)
+
+        output = try_parse_agent_json(result.output, SalesAgentOutput, defaults)
+        if output is None:
+            return SalesAgentOutput.model_construct(**defaults)
+        await self._llm_cache.set(cache_key, output.model_dump_json().encode())
+        return output
@@ -1,14 +1,54 @@
 """Summary Agent - Extracts user information and summarizes conversations."""
 
-import os
-import json
-import re
-import google.generativeai as genai
+import asyncio
+from functools import lru_cache
+import orjson
 from pydantic_ai import Agent
-from pydantic_ai.models.gemini import GeminiModel
+from agents._batcher import SingleFlight
+from agents._bootstrap import get_model
+from agents._json_utils import load_json_object
+from agents._llm_cache import llm_cache, make_key
+from agents._timeouts import run_with_timeout
 from typing import List, Dict, Any, Optional
 
 
+_SYSTEM_PROMPT = """You are a Summary Agent specialized in extracting user information and summarizing conversations.
+
+Your tasks:
+1. Extract user information from conversation messages (name, preferences, contact info, etc.)
+2. Summarize conversations into concise summaries
+3. Identify key topics and tags
+
+Always respond with valid JSON format."""
+
+
+def _format_messages(messages: List[Dict[str, Any]]) -> str:
+    """Render messages as "role: content" lines for a prompt."""
+    return "\n".join(
+        [f"{msg.get('role', 'unknown')}: {msg.get('content', '')}" for msg in messages]
+    )
+
+
+@lru_cache(maxsize=8)
+def _build_agent(model_name: str) -> Agent:
+    """Build the PydanticAI agent shared by every SummaryAgent on a model.
+
+    Args:
+        model_name: Gemini model name to use
+
+    Returns:
+        Configured Agent
+    """
+    return Agent(
+        model=get_model(model_name),
+        system_prompt=_SYSTEM_PROMPT,
+    )
+
+
+# Identical prompts from concurrent sessions share one Gemini call
+_in_flight: SingleFlight = SingleFlight()
+
+
 class SummaryAgent:
     """Agent that extracts user information and summarizes conversations."""
 
@@ -19,26 +59,35 @@ class SummaryAgent:
             model_name: Gemini model name to use
         """
         self.name = "SummaryAgent"
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY environment variable is required")
-
-        # Configure google.generativeai with API key
-        genai.configure(api_key=api_key)
+        self.agent = _build_agent(model_name)
+        self._cache_namespace = make_key(self.name, model_name, _SYSTEM_PROMPT)
+        self._llm_cache = llm_cache.for_agent(self.name)
 
-        system_prompt = """You are a Summary Agent specialized in extracting user information and summarizing conversations.
+    async def _complete(self, prompt: str) -> Optional[Dict[str, Any]]:
+        """Run a prompt and return the JSON object in the response.
 
-Your tasks:
-1. Extract user information from conversation messages (name, preferences, contact info, etc.)
-2. Summarize conversations into concise summaries
-3. Identify key topics and tags
+        Args:
+            prompt: User prompt
 
-Always respond with valid JSON format."""
+        Returns:
+            Parsed dict, or None if the response held no valid JSON object or the
+            call timed out
+        """
+        cache_key = make_key(self._cache_namespace, prompt)
+        cached = await self._llm_cache.get(cache_key)
+        if cached is not None:
+            return orjson.loads(cached)
 
-        self.agent = Agent(
-            model=GeminiModel(model_name),
-            system_prompt=system_prompt,
-        )
+        try:
+            result = await _in_flight.run(
+                cache_key, lambda: run_with_timeout(self.agent.run, prompt)
+            )
+        except asyncio.TimeoutError:
+            return None
+        json_data = load_json_object(result.output)
+        if json_data is not None:
+            await self._llm_cache.set(cache_key, orjson.dumps(json_data))
+        return json_data
 
     async def extract_user_information(self, messages: List[Dict[str, Any]]) -> Dict[str, Any]:
         """Extract user information from conversation messages.
@@ -49,11 +98,9 @@ Always respond with valid JSON format."""
         Returns:
             Dictionary containing extracted user information
         """
-        # Format messages for the agent
-        messages_text = "\n".join(
-            [f"{msg.get('role', 'unknown')}: {msg.get('content', '')}" for msg in messages]
-        )
+        return await self._extract_user_information(_format_messages(messages))
 
+    async def _extract_user_information(self, messages_text: str) -> Dict[str, Any]:
         prompt = f"""Extract user information from the following conversation messages:
 
 {messages_text}
@@ -75,19 +122,9 @@ Respond with JSON format:
     "other_info": {{}}
 }}"""
 
-        result = await self.agent.run(prompt)
-        response_text = str(result.output)
-
-        # Parse JSON response
-        try:
-            if response_text.strip().startswith("{"):
-                return json.loads(response_text)
-            else:
-                json_match = re.search(r"\{.*\}", response_text, re.DOTALL)
-                if json_match:
-                    return json.loads(json_match.group())
-        except (json.JSONDecodeError, ValueError):
-            pass
+        json_data = await self._complete(prompt)
+        if json_data is not None:
+            return json_data
 
         # Fallback
         return {
@@ -113,11 +150,11 @@ Respond with JSON format:
         Returns:
             Dictionary containing new summary and tags
         """
-        # Format messages for the agent
-        messages_text = "\n".join(
-            [f"{msg.get('role', 'unknown')}: {msg.get('content', '')}" for msg in messages]
-        )
+        return await self._summarize_conversation(_format_messages(messages), old_summary)
 
+    async def _summarize_conversation(
+        self, messages_text: str, old_summary: Optional[str]
+    ) -> Dict[str, Any]:
         if old_summary:
             prompt = f"""Update the conversation summary based on new messages.
 
@@ -149,19 +186,9 @@ Respond with JSON format:
     "key_topics": ["topic1", "topic2"]
 }}"""
 
-        result = await self.agent.run(prompt)
-        response_text = str(result.output)
-
-        # Parse JSON response
-        try:
-            if response_text.strip().startswith("{"):
-                return json.loads(response_text)
-            else:
-                json_match = re.search(r"\{.*\}", response_text, re.DOTALL)
-                if json_match:
-                    return json.loads(json_match.group())
-        except (json.JSONDecodeError, ValueError):
-            pass
+        json_data = await self._complete(prompt)
+        if json_data is not None:
+            return json_data
 
         # Fallback
         return {
@@ -169,3 +196,26 @@ Respond with JSON format:
             "tags": [],
             "key_topics": [],
         }
+
+    async def run_both(
+        self,
+        messages: List[Dict[str, Any]],
+        old_summary: Optional[str] = None,
+    ) -> tuple[Dict[str, Any], Dict[str, Any]]:
+        """Extract user information and summarize the conversation concurrently.
+
+        The messages are formatted once and shared by both LLM calls.
+
+        Args:
+            messages: List of message dictionaries
+            old_summary: Previous summary (optional)
+
+        Returns:
+            Tuple of (user information, summary result)
+        """
+        messages_text = _format_messages(messages)
+        user_info, summary_result = await asyncio.gather(
+            self._extract_user_information(messages_text),
+            self._summarize_conversation(messages_text, old_summary),
+        )
+        return user_info, summary_result
@@ -1,32 +1,18 @@
 """Up Sales / Cross Sales Agent - Identifies up-sell and cross-sell opportunities."""
 
-import os
-import json
-import re
-import google.generativeai as genai
+import asyncio
+from functools import lru_cache
 from pydantic_ai import Agent
-from pydantic_ai.models.gemini import GeminiModel
+from agents._batcher import SingleFlight
+from agents._bootstrap import get_model
+from agents._json_utils import try_parse_agent_json
+from agents._llm_cache import llm_cache, make_key
+from agents._prompts import format_short_memory
+from agents._timeouts import run_with_timeout
 from agents.models import UpSalesCrossSalesInput, UpSalesCrossSalesOutput
 
 
-class UpSalesCrossSalesAgent:
-    """Agent that identifies up-sell and cross-sell opportunities based on customer requirements and available combos."""
-
-    def __init__(self, model_name: str = "gemini-2.5-flash"):
-        """Initialize the Up Sales / Cross Sales Agent.
-
-        Args:
-            model_name: Gemini model name to use
-        """
-        self.name = "UpSalesCrossSalesAgent"
-        api_key = os.getenv("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY environment variable is required")
-
-        # Configure google.generativeai with API key
-        genai.configure(api_key=api_key)
-
-        system_prompt = """You are an Up Sales / Cross Sales Agent specialized in identifying opportunities to suggest product combos that meet customer requirements.
+_SYSTEM_PROMPT = """You are an Up Sales / Cross Sales Agent specialized in identifying opportunities to suggest product combos that meet customer requirements.
 
 Your task is to:
 1. Analyze customer requirements (explicit and implicit)
@@ -41,18 +27,48 @@ Considerations:
 - If no suitable combo exists, return null for selected_combo
 
 Always respond with a valid JSON object matching this structure:
-{{
+{
     "selected_combo": "C01",
     "reason": "Đáp ứng nhu cầu tiết kiệm điện và còn đủ tồn kho",
     "response_text": ""
-}}
+}
 
 Note: response_text is usually left empty as it will be used by the Sales Agent."""
 
-        self.agent = Agent(
-            model=GeminiModel(model_name),
-            system_prompt=system_prompt,
-        )
+
+@lru_cache(maxsize=8)
+def _build_agent(model_name: str) -> Agent:
+    """Build the PydanticAI agent shared by every UpSalesCrossSalesAgent on a model.
+
+    Args:
+        model_name: Gemini model name to use
+
+    Returns:
+        Configured Agent
+    """
+    return Agent(
+        model=get_model(model_name),
+        system_prompt=_SYSTEM_PROMPT,
+    )
+
+
+# Identical prompts from concurrent sessions share one Gemini call
+_in_flight: SingleFlight = SingleFlight()
+
+
+class UpSalesCrossSalesAgent:
+    """Agent that identifies up-sell and cross-sell opportunities based on customer requirements and available combos."""
+
+    def __init__(self, model_name: str = "gemini-2.5-flash"):
+        """Initialize the Up Sales / Cross Sales Agent.
+
+        Args:
+            model_name: Gemini model name to use
+        """
+        self.name = "UpSalesCrossSalesAgent"
+        self.agent = _build_agent(model_name)
+        self._cache_namespace = make_key(self.name, model_name, _SYSTEM_PROMPT)
+        self._llm_cache = llm_cache.for_agent(self.name)
 
     async def run(self, input_data: UpSalesCrossSalesInput) -> UpSalesCrossSalesOutput:
         """Identify up-sell/cross-sell opportunities.
@@ -76,22 +92,13 @@ Note: response_text is usually left empty as it will be used by the Sales Agent.
         )
 
         # Format available combos
-        combos_text = ""
-        for combo in input_data.available_combos:
-            products_str = ", ".join(combo.products)
-            combos_text += f"\n- Combo {combo.combo_id}: {products_str} (Stock: {combo.stock})"
+        combos_text = "".join(
+            f"\n- Combo {combo.combo_id}: {', '.join(combo.products)} (Stock: {combo.stock})"
+            for combo in input_data.available_combos
+        )
 
         # Format conversation history
-        memory_text = ""
-        if input_data.short_memory:
-            memory_text = "\n\nRecent conversation history:\n"
-            for i, msg in enumerate(input_data.short_memory[-20:], 1):  # Last 20 messages
-                if isinstance(msg, dict):
-                    role = msg.get("role", "unknown")
-                    content = msg.get("content", "")
-                    memory_text += f"{i}. [{role}]: {content}\n"
-                else:
-                    memory_text += f"{i}. {msg}\n"
+        memory_text = format_short_memory(input_data.short_memory)
 
         # Format summary
         summary_text = ""
@@ -105,46 +112,29 @@ Explicit Requirements: {explicit_req}
 Implicit Requirements: {implicit_req}
 
 Available Combos:{combos_text}
-{memory_text}{summary_text}
-
-Select the best combo that matches the customer's needs. Consider:
-1. How well the combo matches explicit and implicit requirements
-2. Stock availability
-3. Value proposition for the customer
-
-If no suitable combo exists, set selected_combo to null."""
-
-        result = await self.agent.run(prompt)
-
-        # Parse JSON response and validate with Pydantic model
-        response_text = str(result.output)
-
-        # Try to extract JSON from response
+{memory_text}{summary_text}"""
+
+        cache_key = make_key(self._cache_namespace, prompt)
+        cached = await self._llm_cache.get(cache_key)
+        if cached is not None:
+            return UpSalesCrossSalesOutput.model_validate_json(cached)
+
+        # Fallback: no combo selected
+        fallback = UpSalesCrossSalesOutput.model_construct(
+            selected_combo=None,
+            reason="Unable to parse response",
+            response_text="",
+        )
         try:
-            # Try to parse as JSON directly
-            if response_text.strip().startswith("{"):
-                json_data = json.loads(response_text)
-            else:
-                # Try to find JSON in the response
-                json_match = re.search(r"\{.*\}", response_text, re.DOTALL)
-                if json_match:
-                    json_data = json.loads(json_match.group())
-                else:
-                    raise ValueError("No JSON found in response")
-        except (json.JSONDecodeError, ValueError):
-            # Fallback: no combo selected
-            json_data = {
-                "selected_combo": None,
-                "reason": "Unable to parse response",
-                "response_text": "",
-            }
-
-        # Ensure required fields are present
-        if "selected_combo" not in json_data:
-            json_data["selected_combo"] = None
-        if "reason" not in json_data:
-            json_data["reason"] = None
-        if "response_text" not in json_data:
-            json_data["response_text"] = ""
-
-        return UpSalesCrossSalesOutput(**json_data)
+            result = await _in_flight.run(
+                cache_key, lambda: run_with_timeout(self.agent.run, prompt)
+            )
+        except asyncio.TimeoutError:
+            return fallback
+
+        defaults = {"selected_combo": None, "reason": None, "response_text": ""}
+        output = try_parse_agent_json(result.output, UpSalesCrossSalesOutput, defaults)
+        if output is None:
+            return fallback
+        await self._llm_cache.set(cache_key, output.model_dump_json().encode())
+        return output
@@ -5,6 +5,16 @@ import uuid
 import chainlit as cl
 from workflow.orchestrator import WorkflowOrchestrator
 
+# Shared by all chat sessions; per-session state lives in cl.user_session
+_orchestrator: WorkflowOrchestrator | None = None
+
+
+def _get_orchestrator() -> WorkflowOrchestrator:
+    global _orchestrator
+    if _orchestrator is None:
+        _orchestrator = WorkflowOrchestrator()
+    return _orchestrator
+
 
 def _render_phase_trace(phase_trace: list[str]) -> str:
     lines = phase_trace or ["(no trace)"]
@@ -14,7 +24,7 @@ def _render_phase_trace(phase_trace: list[str]) -> str:
 @cl.on_chat_start
 async def start():
     """Initialize the chat session."""
-    orchestrator = WorkflowOrchestrator()
+    orchestrator = _get_orchestrator()
     session_id = str(uuid.uuid4())
     user_id = f"user_{session_id[:8]}"
 
@@ -39,6 +49,14 @@ async def start():
     ).send()
 
 
+@cl.on_chat_end
+async def end():
+    """Release per-session state held by the shared orchestrator."""
+    session_id = cl.user_session.get("session_id")
+    if session_id:
+        _get_orchestrator().end_session(session_id)
+
+
 @cl.on_message
 async def main(message: cl.Message):
     """Handle incoming messages."""
@@ -47,10 +65,6 @@ async def main(message: cl.Message):
     user_id = cl.user_session.get("user_id", "unknown")
     show_progress = bool(cl.user_session.get("show_pipeline_progress", False))
 
-    # Show loading indicator
-    msg = cl.Message(content="")
-    await msg.send()
-
     try:
         # Process message through intent and handoff analysis
         results = await orchestrator.process_user_message(
@@ -60,13 +74,12 @@ async def main(message: cl.Message):
             language="vi",
         )
 
-        phase_trace = results.get("phase_trace", [])
-        final_text = results.get("final_response_text", "")
+        await cl.Message(content=results.get("final_response_text", "")).send()
 
-        # Update / show the right-side debug panel when enabled.
+        # Show the debug panel after the reply, and only when enabled.
         # When disabled, keep the main chat clean.
         if show_progress:
-            trace_md = _render_phase_trace(phase_trace)
+            trace_md = _render_phase_trace(results.get("phase_trace", []))
             trace_block = (
                 "<details>"
                 "<summary><b>Pipeline progress</b></summary>"
@@ -75,10 +88,6 @@ async def main(message: cl.Message):
             )
             await cl.Message(content=trace_block).send()
 
-        msg.content = final_text
-        await msg.update()
-
     except Exception as e:
         error_msg = f"An error occurred: {str(e)}"
-        msg.content = error_msg
-        await msg.update()
+        await cl.Message(content=error_msg).send()
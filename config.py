@@ -15,6 +15,7 @@ from __future__ import annotations
 
 import os
 import uuid
+from functools import lru_cache
 
 
 def _env_bool(name: str, default: bool = False) -> bool:
@@ -24,7 +25,13 @@ def _env_bool(name: str, default: bool = False) -> bool:
     return val.strip().lower() in {"1", "true", "yes", "y", "on"}
 
 
-DEMO_SHOP_ID = uuid.UUID(
+@lru_cache(maxsize=128)
+def parse_uuid(value: str) -> uuid.UUID:
+    """Parse a UUID string, reusing the result for ids seen before."""
+    return uuid.UUID(value)
+
+
+DEMO_SHOP_ID = parse_uuid(
     os.getenv("DEMO_SHOP_ID", "11111111-1111-1111-1111-111111111111")
 )
 DEMO_SHOP_NAME = os.getenv("DEMO_SHOP_NAME", "Vieroc")
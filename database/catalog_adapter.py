@@ -4,19 +4,37 @@ This keeps DB access out of the orchestrator and lets us enable DB-backed
 catalog/inventory gradually.
 
 Today we only implement a minimal read path for products.
+
+Environment variables (optional):
+- CATALOG_CACHE_TTL: seconds a shop's product list is reused before
+  re-querying PostgreSQL (default: 60; 0 disables the cache)
 """
 
 from __future__ import annotations
 
 from dataclasses import dataclass
 from decimal import Decimal
+from functools import lru_cache
 from typing import Optional, Sequence
+import os
+import time
 import uuid
 
+from sqlalchemy import bindparam, select
+
 from database.postgres.client import get_postgres_session
 from database.postgres.models import Product
 
 
+# Built once; each call only binds the shop id and limit
+_PRODUCTS_FOR_SHOP = (
+    select(Product)
+    .where(Product.shop_id == bindparam("shop_id"))
+    .order_by(Product.name.asc())
+    .limit(bindparam("limit"))
+)
+
+
 @dataclass(frozen=True)
 class CatalogProduct:
     id: str
@@ -26,26 +44,50 @@ class CatalogProduct:
     stock_quantity: int
 
 
+_CATALOG_CACHE_TTL = float(os.getenv("CATALOG_CACHE_TTL", "60"))
+_CATALOG_CACHE_SIZE = 64
+# (shop_id, limit) -> (expires_at, products)
+_catalog_cache: dict[tuple[uuid.UUID, int], tuple[float, tuple[CatalogProduct, ...]]] = {}
+
+
+@lru_cache(maxsize=128)
+def _to_uuid(value: str) -> uuid.UUID:
+    return uuid.UUID(value)
+
+
 def list_products_for_shop(shop_id: str | uuid.UUID, limit: int = 50) -> Sequence[CatalogProduct]:
     """Return products for a shop.
 
+    Results are reused for CATALOG_CACHE_TTL seconds, since the catalog changes
+    far less often than users send messages.
+
     Args:
         shop_id: UUID string
         limit: max number of products
     """
     # Be flexible: callers may pass UUID or string.
-    shop_uuid = shop_id if isinstance(shop_id, uuid.UUID) else uuid.UUID(str(shop_id))
+    shop_uuid = shop_id if isinstance(shop_id, uuid.UUID) else _to_uuid(str(shop_id))
+
+    key = (shop_uuid, limit)
+    now = time.monotonic()
+    entry = _catalog_cache.get(key)
+    if entry is not None and entry[0] > now:
+        return entry[1]
+
+    products = _load_products(shop_uuid, limit)
+    if _CATALOG_CACHE_TTL > 0:
+        if key not in _catalog_cache and len(_catalog_cache) >= _CATALOG_CACHE_SIZE:
+            # Drop the oldest entry
+            del _catalog_cache[next(iter(_catalog_cache))]
+        _catalog_cache[key] = (now + _CATALOG_CACHE_TTL, products)
+    return products
 
+
+def _load_products(shop_uuid: uuid.UUID, limit: int) -> tuple[CatalogProduct, ...]:
     db = get_postgres_session()
     try:
-        rows = (
-            db.query(Product)
-            .filter(Product.shop_id == shop_uuid)
-            .order_by(Product.name.asc())
-            .limit(limit)
-            .all()
-        )
-        return [
+        rows = db.scalars(_PRODUCTS_FOR_SHOP, {"shop_id": shop_uuid, "limit": limit}).all()
+        return tuple(
             CatalogProduct(
                 id=str(p.id),
                 name=p.name,
@@ -54,6 +96,6 @@ def list_products_for_shop(shop_id: str | uuid.UUID, limit: int = 50) -> Sequenc
                 stock_quantity=p.stock_quantity,
             )
             for p in rows
-        ]
+        )
     finally:
         db.close()
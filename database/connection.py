@@ -1,34 +1,92 @@
 """Database connection utilities for PostgreSQL, Milvus, and Redis."""
 
 import os
-from typing import Optional
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Optional
+from dotenv import load_dotenv
 from sqlalchemy import create_engine, Engine
 from sqlalchemy.orm import sessionmaker, Session
-from pymilvus import connections, Collection
-from redis import Redis
-from pydantic_settings import BaseSettings
 
+if TYPE_CHECKING:
+    # pymilvus and redis are slow to import; load them only when first used
+    from pymilvus import Collection
+    from redis import Redis
 
-class DatabaseSettings(BaseSettings):
-    """Database configuration settings."""
+# Read .env once; variables already set in the environment take precedence
+load_dotenv()
 
-    postgres_host: str = "localhost"
-    postgres_port: int = 5432
-    postgres_user: str = "postgres"
-    postgres_password: str = "postgres"
-    postgres_db: str = "project_db"
 
-    milvus_host: str = "localhost"
-    milvus_port: int = 19530
+def postgres_pool_options(pre_ping: bool) -> dict[str, Any]:
+    """Connection pool arguments shared by every PostgreSQL engine.
 
-    redis_host: str = "localhost"
-    redis_port: int = 6379
-    redis_db: int = 0
+    Concurrent chats each check out their own connection, and LIFO checkout
+    keeps the pool on its most recently used ones. Without pre-ping (an extra
+    SELECT 1 round-trip per checkout), stale connections are avoided by
+    recycling them after five minutes instead.
 
-    class Config:
-        env_file = ".env"
-        env_file_encoding = "utf-8"
-        extra = "ignore"  # Ignore extra fields from .env that are not database-related
+    Args:
+        pre_ping: Whether to test each connection on checkout
+
+    Returns:
+        Keyword arguments for create_engine
+    """
+    return {
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_use_lifo": True,
+        "pool_pre_ping": pre_ping,
+        "pool_recycle": 1800 if pre_ping else 300,
+    }
+
+
+def redis_pool_options() -> dict[str, Any]:
+    """Connection pool arguments shared by every Redis client.
+
+    Keepalive and periodic health checks let long-lived pooled connections
+    survive idle periods without a failed command first.
+
+    Returns:
+        Keyword arguments for Redis or ConnectionPool
+    """
+    return {
+        "max_connections": 64,
+        "socket_keepalive": True,
+        "health_check_interval": 30,
+    }
+
+
+def _env(name: str, default: str) -> Callable[[], str]:
+    return lambda: os.getenv(name, default)
+
+
+def _env_int(name: str, default: int) -> Callable[[], int]:
+    return lambda: int(os.getenv(name, str(default)))
+
+
+def _env_bool(name: str, default: bool) -> Callable[[], bool]:
+    return lambda: os.getenv(name, str(default)).strip().lower() in {"1", "true", "yes", "on"}
+
+
+@dataclass(frozen=True)
+class DatabaseSettings:
+    """Database configuration settings, read from environment variables."""
+
+    postgres_host: str = field(default_factory=_env("POSTGRES_HOST", "localhost"))
+    postgres_port: int = field(default_factory=_env_int("POSTGRES_PORT", 5432))
+    postgres_user: str = field(default_factory=_env("POSTGRES_USER", "postgres"))
+    postgres_password: str = field(default_factory=_env("POSTGRES_PASSWORD", "postgres"))
+    postgres_db: str = field(default_factory=_env("POSTGRES_DB", "project_db"))
+    # Enable when the database is across a WAN and idle connections may be dropped
+    postgres_pool_pre_ping: bool = field(
+        default_factory=_env_bool("POSTGRES_POOL_PRE_PING", False)
+    )
+
+    milvus_host: str = field(default_factory=_env("MILVUS_HOST", "localhost"))
+    milvus_port: int = field(default_factory=_env_int("MILVUS_PORT", 19530))
+
+    redis_host: str = field(default_factory=_env("REDIS_HOST", "localhost"))
+    redis_port: int = field(default_factory=_env_int("REDIS_PORT", 6379))
+    redis_db: int = field(default_factory=_env_int("REDIS_DB", 0))
 
 
 class DatabaseManager:
@@ -42,9 +100,9 @@ class DatabaseManager:
         """
         self.settings = settings or DatabaseSettings()
         self._postgres_engine: Optional[Engine] = None
-        self._postgres_session: Optional[Session] = None
+        self._session_factory: Optional[sessionmaker[Session]] = None
         self._milvus_connected = False
-        self._redis_client: Optional[Redis] = None
+        self._redis_client: Optional["Redis"] = None
 
     def connect_postgres(self) -> Engine:
         """Connect to PostgreSQL database.
@@ -61,32 +119,43 @@ class DatabaseManager:
             )
             # Enable SQL query logging if DEBUG is enabled
             echo = os.getenv("DEBUG", "false").lower() in ("true", "1", "yes")
-            self._postgres_engine = create_engine(connection_string, echo=echo)
+            self._postgres_engine = create_engine(
+                connection_string,
+                echo=echo,
+                **postgres_pool_options(self.settings.postgres_pool_pre_ping),
+            )
         return self._postgres_engine
 
     def get_postgres_session(self) -> Session:
-        """Get PostgreSQL session.
+        """Get a new PostgreSQL session.
+
+        Sessions are not safe to share between concurrent requests, so each
+        call returns a fresh one; the caller is responsible for closing it.
 
         Returns:
             SQLAlchemy session
         """
-        if self._postgres_session is None:
-            engine = self.connect_postgres()
-            SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-            self._postgres_session = SessionLocal()
-        return self._postgres_session
+        if self._session_factory is None:
+            self._session_factory = sessionmaker(
+                bind=self.connect_postgres(), autoflush=False, expire_on_commit=False
+            )
+        return self._session_factory()
 
     def connect_milvus(self) -> None:
         """Connect to Milvus vector database."""
         if not self._milvus_connected:
-            connections.connect(
-                alias="default",
-                host=self.settings.milvus_host,
-                port=self.settings.milvus_port,
-            )
+            from pymilvus import connections
+
+            # The alias may already have been connected through get_milvus_client
+            if not connections.has_connection("default"):
+                connections.connect(
+                    alias="default",
+                    host=self.settings.milvus_host,
+                    port=self.settings.milvus_port,
+                )
             self._milvus_connected = True
 
-    def get_milvus_collection(self, collection_name: str) -> Collection:
+    def get_milvus_collection(self, collection_name: str) -> "Collection":
         """Get Milvus collection.
 
         Args:
@@ -95,31 +164,38 @@ class DatabaseManager:
         Returns:
             Milvus collection
         """
+        from pymilvus import Collection
+
         self.connect_milvus()
         return Collection(collection_name)
 
-    def connect_redis(self) -> Redis:
+    def connect_redis(self) -> "Redis":
         """Connect to Redis.
 
         Returns:
             Redis client
         """
         if self._redis_client is None:
+            from redis import Redis
+
             self._redis_client = Redis(
                 host=self.settings.redis_host,
                 port=self.settings.redis_port,
                 db=self.settings.redis_db,
                 decode_responses=True,
+                **redis_pool_options(),
             )
         return self._redis_client
 
     def close_all(self) -> None:
         """Close all database connections."""
-        if self._postgres_session:
-            self._postgres_session.close()
         if self._postgres_engine:
             self._postgres_engine.dispose()
+            self._postgres_engine = None
+            self._session_factory = None
         if self._milvus_connected:
+            from pymilvus import connections
+
             connections.disconnect("default")
         if self._redis_client:
             self._redis_client.close()
@@ -1,14 +1,16 @@
 """Debug utilities for database operations."""
 
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import Optional
-from sqlalchemy import text
-from database.connection import db_manager
-from database.postgres.client import get_postgres_session, get_postgres_engine
-from database.redis.client import get_redis_client
-from database.milvus.client import get_milvus_client
 
+# Database clients are imported inside each function, so importing this module
+# (for is_debug_enabled) does not load SQLAlchemy, redis or pymilvus.
 
+
+# Cached: DEBUG is read once, on the first call
+@lru_cache(maxsize=1)
 def is_debug_enabled() -> bool:
     """Check if debug mode is enabled.
 
@@ -26,10 +28,15 @@ def test_postgres_connection() -> bool:
         True if connection successful, False otherwise
     """
     try:
+        from sqlalchemy import text
+        from database.connection import db_manager
+        from database.postgres.client import get_postgres_engine
+
         engine = get_postgres_engine()
         with engine.connect() as conn:
-            result = conn.execute(text("SELECT 1"))
-            result.fetchone()
+            # With pre-ping the checkout has already validated the connection
+            if not db_manager.settings.postgres_pool_pre_ping:
+                conn.execute(text("SELECT 1")).fetchone()
         if is_debug_enabled():
             print("✅ PostgreSQL connection: OK")
         return True
@@ -46,6 +53,8 @@ def test_redis_connection() -> bool:
         True if connection successful, False otherwise
     """
     try:
+        from database.redis.client import get_redis_client
+
         redis_client = get_redis_client()
         redis_client.ping()
         if is_debug_enabled():
@@ -64,7 +73,12 @@ def test_milvus_connection() -> bool:
         True if connection successful, False otherwise
     """
     try:
+        from pymilvus import utility
+        from database.milvus.client import get_milvus_client
+
         get_milvus_client()
+        # The connection may be reused, so make a round-trip to the server
+        utility.get_server_version()
         if is_debug_enabled():
             print("✅ Milvus connection: OK")
         return True
@@ -83,9 +97,7 @@ def print_database_status() -> None:
     print("🗄️  DATABASE CONNECTION STATUS")
     print("=" * 80)
 
-    postgres_ok = test_postgres_connection()
-    redis_ok = test_redis_connection()
-    milvus_ok = test_milvus_connection()
+    test_all_connections()
 
     print("=" * 80 + "\n")
 
@@ -96,6 +108,9 @@ def print_postgres_tables() -> None:
         return
 
     try:
+        from sqlalchemy import text
+        from database.postgres.client import get_postgres_engine
+
         engine = get_postgres_engine()
         with engine.connect() as conn:
             result = conn.execute(
@@ -108,7 +123,7 @@ def print_postgres_tables() -> None:
             """
                 )
             )
-            tables = [row[0] for row in result]
+            tables = result.scalars().all()
 
         print("\n" + "=" * 80)
         print("📊 POSTGRESQL TABLES")
@@ -157,25 +172,43 @@ def print_session_info(session_id: str) -> None:
         print(f"❌ Error getting session info: {e}")
 
 
-def print_redis_keys(pattern: str = "agent:*") -> None:
+def print_redis_keys(pattern: str = "agent:*", count: Optional[int] = None) -> None:
     """Print Redis keys matching pattern.
 
     Args:
         pattern: Key pattern to search (default: "agent:*")
+        count: Keys examined per SCAN call. Larger values mean fewer round-trips
+            but longer individual calls. Defaults to 10000 for prefix patterns
+            (most scanned keys match) and 1000 otherwise.
     """
     if not is_debug_enabled():
         return
 
+    if count is None:
+        count = 10000 if pattern.find("*") > 0 else 1000
+
     try:
+        from database.redis.client import get_redis_client
+
         redis_client = get_redis_client()
-        keys = redis_client.keys(pattern)
+        # SCAN walks the keyspace incrementally instead of blocking Redis like KEYS
+        keys = list(redis_client.scan_iter(match=pattern, count=count))
         print("\n" + "=" * 80)
         print(f"🔑 REDIS KEYS: {pattern}")
         print("=" * 80)
         if keys:
-            for key in sorted(keys):
-                key_type = redis_client.type(key)
-                ttl = redis_client.ttl(key)
+            keys.sort()
+            # Fetch TYPE and TTL for a chunk of keys in one round-trip
+            key_info = []
+            for start in range(0, len(keys), 500):
+                pipe = redis_client.pipeline(transaction=False)
+                for key in keys[start : start + 500]:
+                    pipe.type(key)
+                    pipe.ttl(key)
+                results = pipe.execute()
+                key_info.extend(zip(results[::2], results[1::2]))
+
+            for key, (key_type, ttl) in zip(keys, key_info):
                 ttl_str = f"TTL: {ttl}s" if ttl > 0 else "No TTL"
                 print(f"  {key} ({key_type}, {ttl_str})")
         else:
@@ -188,12 +221,16 @@ def print_redis_keys(pattern: str = "agent:*") -> None:
 def test_all_connections() -> dict:
     """Test all database connections and return status.
 
+    The probes run in parallel, so the total time is that of the slowest one.
+
     Returns:
         Dictionary with connection status for each database
     """
-    status = {
-        "postgres": test_postgres_connection(),
-        "redis": test_redis_connection(),
-        "milvus": test_milvus_connection(),
+    probes = {
+        "postgres": test_postgres_connection,
+        "redis": test_redis_connection,
+        "milvus": test_milvus_connection,
     }
-    return status
+    with ThreadPoolExecutor(max_workers=len(probes)) as executor:
+        futures = {name: executor.submit(probe) for name, probe in probes.items()}
+        return {name: future.result() for name, future in futures.items()}
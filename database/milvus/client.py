@@ -2,7 +2,7 @@
 
 from typing import Optional
 from pymilvus import connections, Collection
-from database.connection import db_manager, DatabaseSettings
+from database.connection import db_manager
 
 
 def get_milvus_client(
@@ -10,7 +10,7 @@ def get_milvus_client(
     port: Optional[int] = None,
     alias: str = "default",
 ) -> None:
-    """Connect to Milvus server.
+    """Connect to Milvus server, unless the alias is already connected.
 
     Args:
         host: Milvus host (defaults to settings)
@@ -29,7 +29,10 @@ def get_milvus_client(
         collection = Collection("my_collection")
         ```
     """
-    settings = DatabaseSettings()
+    if connections.has_connection(alias):
+        return
+
+    settings = db_manager.settings
     connections.connect(
         alias=alias,
         host=host or settings.milvus_host,
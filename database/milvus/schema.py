@@ -1,6 +1,9 @@
 """Milvus schema implementation for semantic memory."""
 
+from functools import lru_cache
 from typing import List, Optional, Dict, Any
+import uuid
+import numpy as np
 from pymilvus import (
     Collection,
     CollectionSchema,
@@ -12,6 +15,85 @@ from pymilvus import (
 from database.connection import db_manager
 from database.milvus.models import SemanticMemoryRecord, SearchResult
 
+# Dense vectors are L2-normalized on insert and query, so inner product equals
+# cosine similarity. HNSW needs no nlist/nprobe tuning.
+_DENSE_INDEX_PARAMS = {
+    "metric_type": "IP",
+    "index_type": "HNSW",
+    "params": {"M": 16, "efConstruction": 200},
+}
+_DENSE_SEARCH_PARAMS = {"metric_type": "IP", "params": {"ef": 64}}
+
+
+def _search_params_for(index_params: Dict[str, Any]) -> Dict[str, Any]:
+    """Build default search params matching an existing dense vector index.
+
+    Collections created before the HNSW/IP index keep their IVF_FLAT/L2 index,
+    and Milvus rejects searches whose metric differs from the index's.
+
+    Args:
+        index_params: Params of the dense_vector index (metric_type, index_type, ...)
+
+    Returns:
+        Search params for collection.search()
+    """
+    metric_type = index_params.get("metric_type", _DENSE_SEARCH_PARAMS["metric_type"])
+    index_type = index_params.get("index_type", "HNSW")
+    if index_type == "HNSW":
+        params: Dict[str, Any] = dict(_DENSE_SEARCH_PARAMS["params"])
+    elif index_type.startswith("IVF"):
+        params = {"nprobe": 10}
+    else:
+        params = {}
+    return {"metric_type": metric_type, "params": params}
+
+
+@lru_cache(maxsize=1024)
+def _shop_expr(shop_id: int) -> str:
+    return f"shop_id == {shop_id}"
+
+
+@lru_cache(maxsize=1024)
+def _doc_expr(doc_id: str) -> str:
+    return f'doc_id == "{doc_id}"'
+
+
+@lru_cache(maxsize=1024)
+def _product_expr(product_id: int, shop_id: Optional[int] = None) -> str:
+    if shop_id is None:
+        return f"product_id == {product_id}"
+    return f"product_id == {product_id} && shop_id == {shop_id}"
+
+
+def _to_search_results(hits: Any) -> List[SearchResult]:
+    """Convert Milvus hits to SearchResult objects.
+
+    The values come from our own schema, so pydantic validation is skipped.
+    """
+    search_results = []
+    for hit in hits:
+        get = hit.entity.get
+        search_results.append(
+            SearchResult.model_construct(
+                id=hit.id,
+                distance=hit.distance,
+                text_content=get("text_content", ""),
+                shop_id=get("shop_id", 0),
+                doc_id=get("doc_id"),
+                product_id=get("product_id"),
+                metadata=get("metadata"),
+            )
+        )
+    return search_results
+
+
+def _normalize(vectors: Any, dtype: type = np.float32) -> np.ndarray:
+    """L2-normalize each row of a (N, dim) array of vectors and cast to dtype."""
+    array = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(array, axis=1, keepdims=True)
+    norms[norms == 0] = 1
+    return (array / norms).astype(dtype, copy=False)
+
 
 def create_semantic_memory_collection(
     collection_name: str,
@@ -32,7 +114,7 @@ def create_semantic_memory_collection(
 
     Schema fields:
         - id: Int64 (Primary Key, AutoID)
-        - dense_vector: FloatVector (semantic vector)
+        - dense_vector: Float16Vector (semantic vector, L2-normalized)
         - sparse_vector: FloatVector (BM25 sparse vector, optional)
         - text_content: VarChar (original content)
         - shop_id: Int64 (Partition Key)
@@ -58,7 +140,8 @@ def create_semantic_memory_collection(
         ),
         FieldSchema(
             name="dense_vector",
-            dtype=DataType.FLOAT_VECTOR,
+            # Normalized vectors lose little precision in FP16, at half the size
+            dtype=DataType.FLOAT16_VECTOR,
             dim=dense_vector_dim,
             description="Semantic vector (dense embedding)",
         ),
@@ -71,6 +154,7 @@ def create_semantic_memory_collection(
         FieldSchema(
             name="shop_id",
             dtype=DataType.INT64,
+            is_partition_key=True,
             description="Partition key - shop identifier",
         ),
         FieldSchema(
@@ -118,14 +202,9 @@ def create_semantic_memory_collection(
     )
 
     # Create index for dense_vector
-    index_params = {
-        "metric_type": "L2",  # or "IP" for inner product
-        "index_type": "IVF_FLAT",  # or "HNSW" for better performance
-        "params": {"nlist": 1024},
-    }
     collection.create_index(
         field_name="dense_vector",
-        index_params=index_params,
+        index_params=_DENSE_INDEX_PARAMS,
     )
 
     # Create index for sparse_vector if exists
@@ -146,13 +225,20 @@ def create_semantic_memory_collection(
 
 
 class SemanticMemoryCollection:
-    """Manages semantic memory collection operations."""
+    """Manages semantic memory collection operations.
+
+    Mutations are not flushed one by one: Milvus seals segments on its own, and
+    inserted or deleted records are searchable before a flush. Call flush()
+    when num_entities must be exact; it is also called automatically after
+    flush_threshold pending mutations.
+    """
 
     def __init__(
         self,
         collection_name: str,
         dense_vector_dim: int = 768,
         sparse_vector_dim: Optional[int] = None,
+        flush_threshold: int = 10_000,
     ):
         """Initialize semantic memory collection manager.
 
@@ -160,10 +246,13 @@ class SemanticMemoryCollection:
             collection_name: Name of the collection
             dense_vector_dim: Dimension of dense vector
             sparse_vector_dim: Dimension of sparse vector (optional)
+            flush_threshold: Pending mutations after which to flush automatically
         """
         self.collection_name = collection_name
         self.dense_vector_dim = dense_vector_dim
         self.sparse_vector_dim = sparse_vector_dim
+        self.flush_threshold = flush_threshold
+        self._dirty_count = 0
 
         # Ensure connection
         db_manager.connect_milvus()
@@ -179,18 +268,26 @@ class SemanticMemoryCollection:
             self.collection = Collection(collection_name)
             if not self.collection.has_index():
                 # Create index if not exists
-                index_params = {
-                    "metric_type": "L2",
-                    "index_type": "IVF_FLAT",
-                    "params": {"nlist": 1024},
-                }
                 self.collection.create_index(
                     field_name="dense_vector",
-                    index_params=index_params,
+                    index_params=_DENSE_INDEX_PARAMS,
                 )
             if not self.collection.is_empty:
                 self.collection.load()
 
+        # Collections created before the FP16 schema still store FP32 vectors
+        dense_field = next(f for f in self.collection.schema.fields if f.name == "dense_vector")
+        self._dense_dtype = (
+            np.float16 if dense_field.dtype == DataType.FLOAT16_VECTOR else np.float32
+        )
+        dense_index = next(
+            (index for index in self.collection.indexes if index.field_name == "dense_vector"),
+            None,
+        )
+        self._search_params = (
+            _search_params_for(dense_index.params) if dense_index else _DENSE_SEARCH_PARAMS
+        )
+
     def insert(self, records: List[SemanticMemoryRecord]) -> List[int]:
         """Insert records into the collection.
 
@@ -203,28 +300,37 @@ class SemanticMemoryCollection:
         if not records:
             return []
 
-        # Convert records to Milvus format
-        data = [record.to_milvus_dict() for record in records]
-
-        # Prepare data for insertion
-        insert_data = {
-            "dense_vector": [r["dense_vector"] for r in data],
-            "text_content": [r["text_content"] for r in data],
-            "shop_id": [r["shop_id"] for r in data],
-            "doc_id": [r.get("doc_id", "") for r in data],
-            "product_id": [r.get("product_id", 0) for r in data],
-            "metadata": [r.get("metadata", {}) for r in data],
-        }
+        # Build the columns in one pass, straight from the records
+        dense_vectors = []
+        sparse_vectors = []
+        text_contents = []
+        shop_ids = []
+        doc_ids = []
+        product_ids = []
+        metadatas = []
+        for record in records:
+            dense_vectors.append(record.dense_vector)
+            text_contents.append(record.text_content)
+            shop_ids.append(record.shop_id)
+            doc_ids.append(record.doc_id if record.doc_id is not None else str(uuid.uuid4()))
+            product_ids.append(record.product_id if record.product_id is not None else 0)
+            metadatas.append(record.metadata if record.metadata is not None else {})
+            if self.sparse_vector_dim is not None:
+                sparse_vectors.append(
+                    record.sparse_vector
+                    if record.sparse_vector is not None
+                    else [0.0] * self.sparse_vector_dim
+                )
 
-        # Add sparse_vector if provided
+        # Column-based insert, in schema field order
+        columns = [_normalize(dense_vectors, self._dense_dtype)]
         if self.sparse_vector_dim is not None:
-            insert_data["sparse_vector"] = [
-                r.get("sparse_vector", [0.0] * self.sparse_vector_dim) for r in data
-            ]
+            columns.append(np.asarray(sparse_vectors, dtype=np.float32))
+        columns += [text_contents, shop_ids, doc_ids, product_ids, metadatas]
 
         # Insert data
-        result = self.collection.insert(insert_data)
-        self.collection.flush()
+        result = self.collection.insert(columns)
+        self._mark_dirty(len(records))
 
         return result.primary_keys
 
@@ -248,6 +354,37 @@ class SemanticMemoryCollection:
         Returns:
             List of SearchResult objects
         """
+        return self.search_batch(
+            [query_vector],
+            shop_id=shop_id,
+            limit=limit,
+            search_params=search_params,
+            output_fields=output_fields,
+        )[0]
+
+    def search_batch(
+        self,
+        query_vectors: List[List[float]],
+        shop_id: Optional[int] = None,
+        limit: int = 10,
+        search_params: Optional[Dict[str, Any]] = None,
+        output_fields: Optional[List[str]] = None,
+    ) -> List[List[SearchResult]]:
+        """Search for several query vectors in a single request.
+
+        Args:
+            query_vectors: Query dense vectors
+            shop_id: Filter by shop_id (optional)
+            limit: Number of results to return per query
+            search_params: Additional search parameters
+            output_fields: Fields to return in results
+
+        Returns:
+            One list of SearchResult objects per query vector, in the same order
+        """
+        if not query_vectors:
+            return []
+
         if output_fields is None:
             output_fields = [
                 "id",
@@ -258,18 +395,19 @@ class SemanticMemoryCollection:
                 "metadata",
             ]
 
-        # Build expression for filtering
+        # shop_id is the partition key, so this filter routes the search to
+        # the shop's partition instead of scanning the whole collection
         expr = None
         if shop_id is not None:
-            expr = f"shop_id == {shop_id}"
+            expr = _shop_expr(shop_id)
 
-        # Default search params
+        # Default search params (match the metric of the collection's index)
         if search_params is None:
-            search_params = {"metric_type": "L2", "params": {"nprobe": 10}}
+            search_params = self._search_params
 
         # Perform search
         results = self.collection.search(
-            data=[query_vector],
+            data=_normalize(query_vectors, self._dense_dtype),
             anns_field="dense_vector",
             param=search_params,
             limit=limit,
@@ -278,20 +416,7 @@ class SemanticMemoryCollection:
         )
 
         # Parse results
-        search_results = []
-        for hit in results[0]:
-            result = SearchResult(
-                id=hit.id,
-                distance=hit.distance,
-                text_content=hit.entity.get("text_content", ""),
-                shop_id=hit.entity.get("shop_id", 0),
-                doc_id=hit.entity.get("doc_id"),
-                product_id=hit.entity.get("product_id"),
-                metadata=hit.entity.get("metadata"),
-            )
-            search_results.append(result)
-
-        return search_results
+        return [_to_search_results(hits) for hits in results]
 
     def search_by_sparse_vector(
         self,
@@ -316,7 +441,7 @@ class SemanticMemoryCollection:
 
         expr = None
         if shop_id is not None:
-            expr = f"shop_id == {shop_id}"
+            expr = _shop_expr(shop_id)
 
         if search_params is None:
             search_params = {"metric_type": "IP", "params": {}}
@@ -330,20 +455,7 @@ class SemanticMemoryCollection:
             output_fields=["id", "text_content", "shop_id", "doc_id", "product_id", "metadata"],
         )
 
-        search_results = []
-        for hit in results[0]:
-            result = SearchResult(
-                id=hit.id,
-                distance=hit.distance,
-                text_content=hit.entity.get("text_content", ""),
-                shop_id=hit.entity.get("shop_id", 0),
-                doc_id=hit.entity.get("doc_id"),
-                product_id=hit.entity.get("product_id"),
-                metadata=hit.entity.get("metadata"),
-            )
-            search_results.append(result)
-
-        return search_results
+        return _to_search_results(results[0])
 
     def delete_by_shop_id(self, shop_id: int) -> None:
         """Delete all records for a specific shop.
@@ -351,9 +463,19 @@ class SemanticMemoryCollection:
         Args:
             shop_id: Shop ID to delete records for
         """
-        expr = f"shop_id == {shop_id}"
-        self.collection.delete(expr)
-        self.collection.flush()
+        self.collection.delete(_shop_expr(shop_id))
+        self._mark_dirty()
+
+    def delete_by_shop_ids(self, shop_ids: List[int]) -> None:
+        """Delete all records for several shops in a single request.
+
+        Args:
+            shop_ids: Shop IDs to delete records for
+        """
+        if not shop_ids:
+            return
+        self.collection.delete(f"shop_id in {[int(shop_id) for shop_id in shop_ids]}")
+        self._mark_dirty()
 
     def delete_by_doc_id(self, doc_id: str) -> None:
         """Delete record by document ID.
@@ -361,9 +483,8 @@ class SemanticMemoryCollection:
         Args:
             doc_id: Document ID to delete
         """
-        expr = f'doc_id == "{doc_id}"'
-        self.collection.delete(expr)
-        self.collection.flush()
+        self.collection.delete(_doc_expr(doc_id))
+        self._mark_dirty()
 
     def delete_by_product_id(self, product_id: int, shop_id: Optional[int] = None) -> None:
         """Delete record by product ID.
@@ -372,16 +493,25 @@ class SemanticMemoryCollection:
             product_id: Product ID to delete
             shop_id: Optional shop_id filter
         """
-        if shop_id is not None:
-            expr = f"product_id == {product_id} && shop_id == {shop_id}"
-        else:
-            expr = f"product_id == {product_id}"
-        self.collection.delete(expr)
+        self.collection.delete(_product_expr(product_id, shop_id))
+        self._mark_dirty()
+
+    def flush(self) -> None:
+        """Seal pending mutations so num_entities reflects them."""
         self.collection.flush()
+        self._dirty_count = 0
+
+    def _mark_dirty(self, count: int = 1) -> None:
+        self._dirty_count += count
+        if self._dirty_count >= self.flush_threshold:
+            self.flush()
 
     def get_stats(self) -> Dict[str, Any]:
         """Get collection statistics.
 
+        num_entities only counts flushed records; call flush() first for an
+        exact count.
+
         Returns:
             Dictionary with collection stats
         """
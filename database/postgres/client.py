@@ -1,9 +1,26 @@
 """PostgreSQL client utilities."""
 
+from functools import lru_cache
 from typing import Optional
 from sqlalchemy import Engine, create_engine
 from sqlalchemy.orm import sessionmaker, Session
-from database.connection import db_manager, DatabaseSettings
+from database.connection import db_manager, postgres_pool_options
+
+
+@lru_cache(maxsize=8)
+def _build_engine(
+    host: str, port: int, user: str, password: str, database: str, pre_ping: bool
+) -> Engine:
+    # One engine (and connection pool) per distinct connection target
+    return create_engine(
+        f"postgresql://{user}:{password}@{host}:{port}/{database}",
+        **postgres_pool_options(pre_ping),
+    )
+
+
+@lru_cache(maxsize=8)
+def _sessionmaker_for(engine: Engine) -> sessionmaker[Session]:
+    return sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
 
 
 def get_postgres_engine(
@@ -15,6 +32,9 @@ def get_postgres_engine(
 ) -> Engine:
     """Get a PostgreSQL engine instance.
 
+    Engines are cached per connection target, so repeated calls share one
+    connection pool. With no arguments this is the database manager's engine.
+
     Args:
         host: PostgreSQL host (defaults to settings)
         port: PostgreSQL port (defaults to settings)
@@ -40,20 +60,24 @@ def get_postgres_engine(
         )
         ```
     """
-    settings = DatabaseSettings()
-    connection_string = (
-        f"postgresql://{user or settings.postgres_user}:"
-        f"{password or settings.postgres_password}@"
-        f"{host or settings.postgres_host}:{port or settings.postgres_port}/"
-        f"{database or settings.postgres_db}"
+    if host is None and port is None and user is None and password is None and database is None:
+        return db_manager.connect_postgres()
+
+    settings = db_manager.settings
+    return _build_engine(
+        host or settings.postgres_host,
+        port or settings.postgres_port,
+        user or settings.postgres_user,
+        password or settings.postgres_password,
+        database or settings.postgres_db,
+        settings.postgres_pool_pre_ping,
     )
-    return create_engine(connection_string)
 
 
 def get_postgres_session(
     engine: Optional[Engine] = None,
 ) -> Session:
-    """Get a PostgreSQL session.
+    """Get a new PostgreSQL session; the caller is responsible for closing it.
 
     Args:
         engine: SQLAlchemy engine (uses default if not provided)
@@ -77,8 +101,7 @@ def get_postgres_session(
     if engine is None:
         return db_manager.get_postgres_session()
 
-    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-    return SessionLocal()
+    return _sessionmaker_for(engine)()
 
 
 def get_default_postgres_engine() -> Engine:
@@ -10,13 +10,19 @@ from sqlalchemy import (
     Text,
     DateTime,
     ForeignKey,
+    Index,
     JSON,
     Sequence,
+    event,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import DeclarativeBase, relationship
 import uuid
 
+# Number of hash partitions of the messages table (fixed once the table is created)
+MESSAGE_PARTITIONS = 16
+
 
 class Base(DeclarativeBase):
     """Base class for all models."""
@@ -28,6 +34,15 @@ class Shop(Base):
     """Shop model - stores information about individual shops."""
 
     __tablename__ = "shops"
+    __table_args__ = (
+        # Accelerates containment filters (bot_config @> '{...}'), not ->> comparisons
+        Index(
+            "ix_shops_bot_config_gin",
+            "bot_config",
+            postgresql_using="gin",
+            postgresql_ops={"bot_config": "jsonb_path_ops"},
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, comment="Shop ID")
     name = Column(Text, nullable=False, comment="Shop name")
@@ -168,9 +183,25 @@ class Session(Base):
     """Session model - stores information about user sessions (Episodic Memory)."""
 
     __tablename__ = "sessions"
+    __table_args__ = (
+        # Accelerates containment filters (metadata @> '{...}'), not ->> comparisons
+        Index(
+            "ix_sessions_metadata_gin",
+            "metadata",
+            postgresql_using="gin",
+            postgresql_ops={"metadata": "jsonb_path_ops"},
+        ),
+        # Lists a user's recent conversations with an index-only scan, no sort
+        Index(
+            "ix_sessions_user_updated",
+            "user_id",
+            text("updated_at DESC"),
+            postgresql_include=["title", "current_stage_id"],
+        ),
+    )
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, comment="Session ID")
-    user_id = Column(UUID(as_uuid=True), nullable=False, index=True, comment="User identifier")
+    user_id = Column(UUID(as_uuid=True), nullable=False, comment="User identifier")
     title = Column(Text, nullable=True, comment="Conversation title")
     handoff_reason = Column(
         Text,
@@ -212,14 +243,34 @@ class Message(Base):
     """Message model - stores individual messages in a session."""
 
     __tablename__ = "messages"
+    __table_args__ = (
+        # Accelerates containment filters (tool_calls @> '{...}'), not ->> comparisons
+        Index(
+            "ix_messages_tool_calls_gin",
+            "tool_calls",
+            postgresql_using="gin",
+            postgresql_ops={"tool_calls": "jsonb_path_ops"},
+        ),
+        # Serves "last N messages of a session"; also covers plain session_id lookups
+        Index("ix_messages_session_id_created_at", "session_id", text("created_at DESC")),
+        # Messages are append-mostly, so a small BRIN index is enough for time-range pruning
+        Index(
+            "ix_messages_created_brin",
+            "created_at",
+            postgresql_using="brin",
+            postgresql_with={"pages_per_range": 32},
+        ),
+        # Partitions are created by _create_message_partitions below
+        {"postgresql_partition_by": "HASH (session_id)"},
+    )
 
+    # The partition key must be part of the primary key
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4, comment="Message ID")
     session_id = Column(
         UUID(as_uuid=True),
         ForeignKey("sessions.id", ondelete="CASCADE"),
-        nullable=False,
-        index=True,
-        comment="Session ID (FK to sessions)",
+        primary_key=True,
+        comment="Session ID (FK to sessions, hash partition key)",
     )
     role = Column(
         String(50), nullable=False, comment="Sender role: user, assistant, system, or tool"
@@ -238,3 +289,20 @@ class Message(Base):
 
     def __repr__(self):
         return f"<Message(id={self.id}, session_id={self.session_id}, role={self.role})>"
+
+
+@event.listens_for(Message.__table__, "after_create")
+def _create_message_partitions(target, connection, **kw):
+    """Create the hash partitions of the messages table right after the parent.
+
+    Indexes declared on the parent are created on each partition automatically.
+    """
+    if connection.dialect.name != "postgresql":
+        return
+    for remainder in range(MESSAGE_PARTITIONS):
+        connection.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS messages_p{remainder} PARTITION OF messages "
+                f"FOR VALUES WITH (MODULUS {MESSAGE_PARTITIONS}, REMAINDER {remainder})"
+            )
+        )
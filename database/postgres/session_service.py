@@ -1,12 +1,32 @@
 """Service for managing sessions in PostgreSQL (Episodic Memory)."""
 
-from typing import Optional, Dict, Any
+from datetime import datetime
+from functools import lru_cache
+from typing import Optional, Dict, Any, List
 import uuid
+from sqlalchemy import bindparam, cast, func, insert, select, update
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
 from sqlalchemy.orm import Session
-from database.postgres.models import Session as SessionModel
+from database.postgres.models import Message as MessageModel, Session as SessionModel
 from database.postgres.client import get_postgres_session
 
 
+@lru_cache(maxsize=4096)
+def _to_uuid(value: str) -> uuid.UUID:
+    # Session ids repeat on every message of a conversation
+    return uuid.UUID(value)
+
+
+@lru_cache(maxsize=4096)
+def _name_uuid(name: str) -> uuid.UUID:
+    # uuid5 hashes with SHA-1; non-UUID user ids repeat per request
+    return uuid.uuid5(uuid.NAMESPACE_DNS, name)
+
+
+# Built once; SQLAlchemy reuses the compiled form and each call only binds the id
+_SESSION_BY_ID = select(SessionModel).where(SessionModel.id == bindparam("session_id"))
+
+
 def update_handoff_reason(
     session_id: str,
     handoff_reason: Optional[str],
@@ -22,33 +42,40 @@ def update_handoff_reason(
     Returns:
         Session object
     """
-    if db_session is None:
+    owns_session = db_session is None
+    if owns_session:
         db_session = get_postgres_session()
 
-    # Convert session_id to UUID if it's a string
     try:
-        session_uuid = uuid.UUID(session_id) if isinstance(session_id, str) else session_id
-    except ValueError:
-        raise ValueError(f"Invalid session_id format: {session_id}")
-
-    # Try to find existing session
-    session = db_session.query(SessionModel).filter(SessionModel.id == session_uuid).first()
-
-    if session:
-        # Update existing session
-        session.handoff_reason = handoff_reason
-    else:
-        # Create new session if not exists
-        session = SessionModel(
-            id=session_uuid,
-            user_id=uuid.uuid4(),  # Default user_id, should be provided
-            handoff_reason=handoff_reason,
+        # Convert session_id to UUID if it's a string
+        try:
+            session_uuid = _to_uuid(session_id) if isinstance(session_id, str) else session_id
+        except ValueError:
+            raise ValueError(f"Invalid session_id format: {session_id}")
+
+        # Update existing session in one round-trip
+        stmt = (
+            update(SessionModel)
+            .where(SessionModel.id == session_uuid)
+            .values(handoff_reason=handoff_reason)
+            .returning(SessionModel)
         )
-        db_session.add(session)
+        session = db_session.execute(stmt).scalar_one_or_none()
 
-    db_session.commit()
-    db_session.refresh(session)
-    return session
+        if session is None:
+            # Create new session if not exists
+            session = SessionModel(
+                id=session_uuid,
+                user_id=uuid.uuid4(),  # Default user_id, should be provided
+                handoff_reason=handoff_reason,
+            )
+            db_session.add(session)
+
+        db_session.commit()
+        return session
+    finally:
+        if owns_session:
+            db_session.close()
 
 
 def get_or_create_session(
@@ -68,40 +95,42 @@ def get_or_create_session(
     Returns:
         Session object
     """
-    if db_session is None:
+    owns_session = db_session is None
+    if owns_session:
         db_session = get_postgres_session()
 
-    # Convert session_id to UUID
     try:
-        session_uuid = uuid.UUID(session_id) if isinstance(session_id, str) else session_id
-    except ValueError:
-        raise ValueError(f"Invalid session_id format (must be UUID): {session_id}")
-
-    # Try to convert user_id to UUID, but allow non-UUID strings
-    # If user_id is not a valid UUID, we'll need to handle it differently
-    # For now, let's try to convert and if it fails, we'll use a default UUID
-    try:
-        user_uuid = uuid.UUID(user_id) if isinstance(user_id, str) else user_id
-    except (ValueError, AttributeError):
-        # If user_id is not a valid UUID, generate a deterministic UUID from the string
-        # This allows non-UUID user_ids to work
-        user_uuid = uuid.uuid5(uuid.NAMESPACE_DNS, str(user_id))
-
-    # Try to find existing session
-    session = db_session.query(SessionModel).filter(SessionModel.id == session_uuid).first()
-
-    if not session:
-        # Create new session
-        session = SessionModel(
-            id=session_uuid,
-            user_id=user_uuid,
-            title=title,
+        # Convert session_id to UUID
+        try:
+            session_uuid = _to_uuid(session_id) if isinstance(session_id, str) else session_id
+        except ValueError:
+            raise ValueError(f"Invalid session_id format (must be UUID): {session_id}")
+
+        # Try to convert user_id to UUID, but allow non-UUID strings
+        # If user_id is not a valid UUID, we'll need to handle it differently
+        # For now, let's try to convert and if it fails, we'll use a default UUID
+        try:
+            user_uuid = _to_uuid(user_id) if isinstance(user_id, str) else user_id
+        except (ValueError, AttributeError):
+            # If user_id is not a valid UUID, generate a deterministic UUID from the string
+            # This allows non-UUID user_ids to work
+            user_uuid = _name_uuid(str(user_id))
+
+        # Insert the session, or return the existing row, in one atomic statement.
+        # The no-op DO UPDATE (rather than DO NOTHING) makes RETURNING yield the
+        # existing row on conflict.
+        stmt = (
+            pg_insert(SessionModel)
+            .values(id=session_uuid, user_id=user_uuid, title=title)
+            .on_conflict_do_update(index_elements=[SessionModel.id], set_={"id": session_uuid})
+            .returning(SessionModel)
         )
-        db_session.add(session)
+        session = db_session.execute(stmt).scalar_one()
         db_session.commit()
-        db_session.refresh(session)
-
-    return session
+        return session
+    finally:
+        if owns_session:
+            db_session.close()
 
 
 def update_session_handoff(
@@ -123,33 +152,44 @@ def update_session_handoff(
     Returns:
         Session object
     """
-    if db_session is None:
+    owns_session = db_session is None
+    if owns_session:
         db_session = get_postgres_session()
 
     try:
-        session_uuid = uuid.UUID(session_id) if isinstance(session_id, str) else session_id
-    except ValueError:
-        raise ValueError(f"Invalid session_id format: {session_id}")
-
-    session = db_session.query(SessionModel).filter(SessionModel.id == session_uuid).first()
-
-    if not session:
-        raise ValueError(f"Session not found: {session_id}")
+        try:
+            session_uuid = _to_uuid(session_id) if isinstance(session_id, str) else session_id
+        except ValueError:
+            raise ValueError(f"Invalid session_id format: {session_id}")
+
+        # Update fields with a single UPDATE ... RETURNING
+        values: Dict[str, Any] = {"updated_at": datetime.utcnow()}
+        if handoff_reason is not None:
+            values["handoff_reason"] = handoff_reason
+        if current_stage_id is not None:
+            values["current_stage_id"] = current_stage_id
+        if metadata is not None:
+            # Merge in Postgres: keys in metadata overwrite, other keys are kept
+            values["session_metadata"] = func.coalesce(
+                SessionModel.session_metadata, cast({}, JSONB)
+            ).op("||")(cast(metadata, JSONB))
+
+        stmt = (
+            update(SessionModel)
+            .where(SessionModel.id == session_uuid)
+            .values(**values)
+            .returning(SessionModel)
+        )
+        session = db_session.execute(stmt).scalar_one_or_none()
 
-    # Update fields
-    if handoff_reason is not None:
-        session.handoff_reason = handoff_reason
-    if current_stage_id is not None:
-        session.current_stage_id = current_stage_id
-    if metadata is not None:
-        if session.session_metadata:
-            session.session_metadata.update(metadata)
-        else:
-            session.session_metadata = metadata
+        if session is None:
+            raise ValueError(f"Session not found: {session_id}")
 
-    db_session.commit()
-    db_session.refresh(session)
-    return session
+        db_session.commit()
+        return session
+    finally:
+        if owns_session:
+            db_session.close()
 
 
 def get_session(
@@ -165,12 +205,49 @@ def get_session(
     Returns:
         Session object or None if not found
     """
-    if db_session is None:
+    owns_session = db_session is None
+    if owns_session:
         db_session = get_postgres_session()
 
     try:
-        session_uuid = uuid.UUID(session_id) if isinstance(session_id, str) else session_id
-    except ValueError:
-        return None
+        try:
+            session_uuid = _to_uuid(session_id) if isinstance(session_id, str) else session_id
+        except ValueError:
+            return None
 
-    return db_session.query(SessionModel).filter(SessionModel.id == session_uuid).first()
+        return db_session.scalars(_SESSION_BY_ID, {"session_id": session_uuid}).first()
+    finally:
+        if owns_session:
+            db_session.close()
+
+
+def bulk_insert_messages(
+    rows: List[Dict[str, Any]],
+    db_session: Optional[Session] = None,
+    chunk_size: int = 1000,
+) -> int:
+    """Insert many messages with executemany instead of one ORM object per row.
+
+    Args:
+        rows: Column values per message (session_id, role, content, ...)
+        db_session: Database session (uses default if not provided)
+        chunk_size: Maximum rows per INSERT statement
+
+    Returns:
+        Number of inserted rows
+    """
+    if not rows:
+        return 0
+
+    owns_session = db_session is None
+    if owns_session:
+        db_session = get_postgres_session()
+
+    try:
+        for start in range(0, len(rows), chunk_size):
+            db_session.execute(insert(MessageModel), rows[start : start + chunk_size])
+        db_session.commit()
+        return len(rows)
+    finally:
+        if owns_session:
+            db_session.close()
@@ -1,8 +1,22 @@
 """Redis client utilities."""
 
-from typing import Optional
-from redis import Redis
-from database.connection import db_manager, DatabaseSettings
+from functools import lru_cache
+from typing import Any, Callable, List, Optional
+from redis import ConnectionPool, Redis
+from redis.client import Pipeline
+from database.connection import db_manager, redis_pool_options
+
+
+@lru_cache(maxsize=8)
+def _build_pool(host: str, port: int, db: int, decode_responses: bool) -> ConnectionPool:
+    """Build the connection pool shared by every client for one Redis database."""
+    return ConnectionPool(
+        host=host,
+        port=port,
+        db=db,
+        decode_responses=decode_responses,
+        **redis_pool_options(),
+    )
 
 
 def get_redis_client(
@@ -13,6 +27,8 @@ def get_redis_client(
 ) -> Redis:
     """Get a Redis client instance.
 
+    Clients for the same host, port and database share one connection pool.
+
     Args:
         host: Redis host (defaults to settings)
         port: Redis port (defaults to settings)
@@ -39,13 +55,37 @@ def get_redis_client(
         return db_manager.connect_redis()
 
     # Use custom connection
-    settings = DatabaseSettings()
-    return Redis(
-        host=host or settings.redis_host,
-        port=port or settings.redis_port,
-        db=db if db is not None else settings.redis_db,
-        decode_responses=decode_responses,
+    settings = db_manager.settings
+    pool = _build_pool(
+        host or settings.redis_host,
+        port or settings.redis_port,
+        db if db is not None else settings.redis_db,
+        decode_responses,
     )
+    return Redis(connection_pool=pool)
+
+
+def pipelined(client: Redis, fn: Callable[[Pipeline], Any]) -> List[Any]:
+    """Send several commands in one round-trip.
+
+    Args:
+        client: Redis client
+        fn: Function that queues commands on the pipeline it is given
+
+    Returns:
+        Command results, in the order the commands were queued
+
+    Example:
+        ```python
+        total, _ = pipelined(
+            redis_client,
+            lambda pipe: pipe.hincrby(key, "total_tokens", 10).expire(key, 3600),
+        )
+        ```
+    """
+    pipe = client.pipeline(transaction=False)
+    fn(pipe)
+    return pipe.execute()
 
 
 # Convenience: Export a default client instance
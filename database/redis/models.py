@@ -1,6 +1,7 @@
 """Pydantic models for Redis schema."""
 
-from typing import Optional, Dict, Any, Literal
+from typing import Optional, Dict, Any, Literal, Union
+import orjson
 from pydantic import BaseModel, Field
 from datetime import datetime
 
@@ -20,6 +21,26 @@ class ConversationMessage(BaseModel):
     timestamp: int = Field(description="Unix timestamp")
     metadata: MessageMetadata = Field(description="Message metadata")
 
+    def to_bytes(self) -> bytes:
+        """Serialize the message for the Redis conversation buffer.
+
+        Returns:
+            JSON-encoded message
+        """
+        return orjson.dumps(self.model_dump())
+
+    @classmethod
+    def from_bytes(cls, data: Union[bytes, str]) -> "ConversationMessage":
+        """Deserialize a message read from the Redis conversation buffer.
+
+        Args:
+            data: JSON-encoded message (bytes, or str from a decoding client)
+
+        Returns:
+            ConversationMessage object
+        """
+        return cls.model_validate(orjson.loads(data))
+
 
 class ActiveContextData(BaseModel):
     """Active context / scratchpad data."""
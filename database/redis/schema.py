@@ -1,10 +1,11 @@
 """Redis schema implementation for short-term memory."""
 
-import json
 import time
 from typing import List, Optional, Dict, Any
+import orjson
 from redis import Redis
 from database.connection import db_manager
+from database.redis.client import pipelined
 from database.redis.models import ConversationMessage, ActiveContextData, MessageMetadata
 
 
@@ -51,12 +52,14 @@ class ConversationBuffer:
             metadata=MessageMetadata(tokens=tokens, intent=intent),
         )
 
-        # Add message to list
-        self.redis_client.rpush(self.key, message.model_dump_json())
+        def queue(pipe):
+            # Add message to list
+            pipe.rpush(self.key, message.to_bytes())
+            # Reset TTL on new interaction
+            if ttl:
+                pipe.expire(self.key, ttl)
 
-        # Reset TTL on new interaction
-        if ttl:
-            self.redis_client.expire(self.key, ttl)
+        pipelined(self.redis_client, queue)
 
     def get_messages(self, start: int = 0, end: int = -1) -> List[ConversationMessage]:
         """Retrieve conversation messages.
@@ -69,7 +72,15 @@ class ConversationBuffer:
             List of conversation messages
         """
         messages_json = self.redis_client.lrange(self.key, start, end)
-        return [ConversationMessage.model_validate_json(msg) for msg in messages_json]
+        return [ConversationMessage.from_bytes(msg) for msg in messages_json]
+
+    def count(self) -> int:
+        """Return the number of messages in the buffer without loading them.
+
+        Returns:
+            Message count
+        """
+        return self.redis_client.llen(self.key)
 
     def trim_conversation(self, max_messages: int) -> None:
         """Trim conversation to keep only the most recent messages.
@@ -126,9 +137,14 @@ class ActiveContext:
             created_at=current_time,
             updated_at=current_time,
         )
-        self._update_hash(context.model_dump(exclude_none=True))
-        if ttl:
-            self.redis_client.expire(self.key, ttl)
+        mapping = self._to_mapping(context.model_dump(exclude_none=True))
+
+        def queue(pipe):
+            pipe.hset(self.key, mapping=mapping)
+            if ttl:
+                pipe.expire(self.key, ttl)
+
+        pipelined(self.redis_client, queue)
 
     def update_field(
         self,
@@ -143,17 +159,16 @@ class ActiveContext:
             value: New value
             ttl: Time to live in seconds (resets TTL if provided)
         """
-        # Update the field
-        if isinstance(value, (dict, list)):
-            value = json.dumps(value)
-        self.redis_client.hset(self.key, field, str(value))
+        # Update the field and the updated_at timestamp
+        mapping = self._to_mapping({field: value, "updated_at": int(time.time())})
 
-        # Update updated_at timestamp
-        self.redis_client.hset(self.key, "updated_at", int(time.time()))
+        def queue(pipe):
+            pipe.hset(self.key, mapping=mapping)
+            # Reset TTL on interaction
+            if ttl:
+                pipe.expire(self.key, ttl)
 
-        # Reset TTL on interaction
-        if ttl:
-            self.redis_client.expire(self.key, ttl)
+        pipelined(self.redis_client, queue)
 
     def get_context(self) -> ActiveContextData:
         """Retrieve the entire context.
@@ -169,8 +184,8 @@ class ActiveContext:
         for key in ["extracted_entities"]:
             if key in context_dict and context_dict[key]:
                 try:
-                    context_dict[key] = json.loads(context_dict[key])
-                except (json.JSONDecodeError, TypeError):
+                    context_dict[key] = orjson.loads(context_dict[key])
+                except (orjson.JSONDecodeError, TypeError):
                     pass
 
         # Convert numeric fields
@@ -193,13 +208,13 @@ class ActiveContext:
         Returns:
             New token count
         """
-        new_total = self.redis_client.hincrby(self.key, "total_tokens", amount)
-        self.redis_client.hset(self.key, "updated_at", int(time.time()))
+        def queue(pipe):
+            pipe.hincrby(self.key, "total_tokens", amount)
+            pipe.hset(self.key, "updated_at", int(time.time()))
+            if ttl:
+                pipe.expire(self.key, ttl)
 
-        if ttl:
-            self.redis_client.expire(self.key, ttl)
-
-        return new_total
+        return pipelined(self.redis_client, queue)[0]
 
     def set_current_goal(self, goal: str, ttl: Optional[int] = None) -> None:
         """Set current goal.
@@ -237,16 +252,20 @@ class ActiveContext:
         """
         self.update_field("user_mood", mood, ttl)
 
-    def _update_hash(self, data: Dict[str, Any]) -> None:
-        """Internal method to update hash with dictionary.
+    @staticmethod
+    def _to_mapping(data: Dict[str, Any]) -> Dict[str, str]:
+        """Internal method to convert a dictionary to hash field values.
 
         Args:
             data: Dictionary of field-value pairs
+
+        Returns:
+            Dictionary with JSON-encoded containers and string values
         """
-        for key, value in data.items():
-            if isinstance(value, (dict, list)):
-                value = json.dumps(value)
-            self.redis_client.hset(self.key, key, str(value))
+        return {
+            key: orjson.dumps(value).decode() if isinstance(value, (dict, list)) else str(value)
+            for key, value in data.items()
+        }
 
     def clear(self) -> None:
         """Clear all context data."""
@@ -280,8 +299,12 @@ class RedisMemoryManager:
 
     def reset_ttl(self) -> None:
         """Reset TTL for both conversation and context."""
-        self.redis_client.expire(self.conversation.key, self.default_ttl)
-        self.redis_client.expire(self.context.key, self.default_ttl)
+        pipelined(
+            self.redis_client,
+            lambda pipe: pipe.expire(self.conversation.key, self.default_ttl).expire(
+                self.context.key, self.default_ttl
+            ),
+        )
 
     def add_interaction(
         self,
@@ -316,7 +339,10 @@ class RedisMemoryManager:
     def get_conversation_history(
         self, max_messages: Optional[int] = None
     ) -> List[ConversationMessage]:
-        """Get conversation history, optionally trimmed.
+        """Get conversation history, optionally limited to the most recent messages.
+
+        Only the requested tail is read from Redis; the buffer itself is left
+        intact so the sliding window can still archive older messages.
 
         Args:
             max_messages: Maximum number of messages to return
@@ -325,7 +351,7 @@ class RedisMemoryManager:
             List of conversation messages
         """
         if max_messages:
-            self.conversation.trim_conversation(max_messages)
+            return self.conversation.get_messages(-max_messages, -1)
         return self.conversation.get_messages()
 
     def clear_all(self) -> None:
@@ -0,0 +1,57 @@
+"""Tests for the analyse handoff agent."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from agents.analyse_handoff_agent import AnalyseHandoffAgent
+from agents.models import AnalyseHandoffInput, AnalyseHandoffOutput, EmotionScore, PolicyFlags
+
+
+def _input(message: str) -> AnalyseHandoffInput:
+    return AnalyseHandoffInput(user_id="u1", session_id="s1", raw_message=message, language="vi")
+
+
+@pytest.mark.parametrize("message", ["fuck off", "ngu vãi", "đm shop", "vcl"])
+async def test_short_abusive_messages_reach_the_model(monkeypatch, message):
+    """Test that short insults are analysed by the model instead of skipped as neutral."""
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    agent = AnalyseHandoffAgent()
+    prompts = []
+
+    async def run(prompt):
+        prompts.append(prompt)
+        return SimpleNamespace(
+            output=AnalyseHandoffOutput(
+                user_id="u1",
+                policy_flags=PolicyFlags(),
+                emotion_score=EmotionScore(anger=0.9),
+                handoff_required=True,
+                handoff_reason="Abusive language",
+                risk_level="high",
+                confidence=0.9,
+            )
+        )
+
+    agent.agent = SimpleNamespace(run=run)
+
+    output = await agent.run(_input(message))
+
+    assert len(prompts) == 1
+    assert output.handoff_required is True
+
+
+async def test_short_neutral_message_skips_the_model(monkeypatch):
+    """Test that a short neutral message is answered without an LLM call."""
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    agent = AnalyseHandoffAgent()
+
+    async def run(prompt):
+        raise AssertionError("model should not be called")
+
+    agent.agent = SimpleNamespace(run=run)
+
+    output = await agent.run(_input("cảm ơn"))
+
+    assert output.handoff_required is False
+    assert output.risk_level == "low"
@@ -0,0 +1,76 @@
+"""Tests for the async micro-batcher."""
+
+import asyncio
+
+import pytest
+
+from agents._batcher import AsyncBatcher, SingleFlight, gather_bounded
+
+
+async def test_batcher_coalesces_by_key():
+    """Test that concurrent submits with the same key share one handler call."""
+    batches = []
+
+    async def handler(items):
+        batches.append(list(items))
+        return [item * 10 for item in items]
+
+    batcher = AsyncBatcher(handler, max_batch=3, max_wait_ms=10)
+    results = await asyncio.gather(
+        batcher.submit(1, key="a"),
+        batcher.submit(2, key="a"),
+        batcher.submit(3, key="b"),
+        batcher.submit(4, key="a"),
+        batcher.submit(5, key="a"),
+    )
+
+    assert results == [10, 20, 30, 40, 50]
+    assert sorted(batches) == [[1, 2, 4], [3], [5]]
+
+
+async def test_batcher_propagates_handler_errors():
+    """Test that a failing handler fails every item in the batch."""
+
+    async def handler(items):
+        raise RuntimeError("boom")
+
+    batcher = AsyncBatcher(handler, max_wait_ms=1)
+    with pytest.raises(RuntimeError):
+        await asyncio.gather(batcher.submit(1), batcher.submit(2))
+
+
+async def test_single_flight_shares_in_flight_calls():
+    """Test that concurrent calls with the same key run once and later calls run again."""
+    calls = []
+
+    async def call(value):
+        calls.append(value)
+        await asyncio.sleep(0.001)
+        return value
+
+    flight = SingleFlight()
+    results = await asyncio.gather(
+        flight.run("a", lambda: call(1)),
+        flight.run("a", lambda: call(2)),
+        flight.run("b", lambda: call(3)),
+    )
+    assert results == [1, 1, 3]
+    assert await flight.run("a", lambda: call(4)) == 4
+    assert calls == [1, 3, 4]
+
+
+async def test_gather_bounded_limits_concurrency():
+    """Test that results keep input order and concurrency stays within the limit."""
+    in_flight = 0
+    peak = 0
+
+    async def work(item):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        return item * 2
+
+    assert await gather_bounded(work, list(range(10)), concurrency=3) == [i * 2 for i in range(10)]
+    assert peak <= 3
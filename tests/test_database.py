@@ -20,3 +20,66 @@ def test_database_manager_initialization():
     # Note: Actual connection tests would require running services
     # manager.connect_postgres()
     # assert manager._postgres_engine is not None
+
+
+def test_list_products_for_shop_is_cached(monkeypatch):
+    """Repeated catalog reads for a shop reuse the first query's result."""
+    import uuid
+    from database import catalog_adapter
+
+    calls = []
+
+    def fake_load(shop_uuid, limit):
+        calls.append((shop_uuid, limit))
+        return ()
+
+    monkeypatch.setattr(catalog_adapter, "_load_products", fake_load)
+    monkeypatch.setattr(catalog_adapter, "_catalog_cache", {})
+    shop_id = uuid.uuid4()
+
+    assert catalog_adapter.list_products_for_shop(shop_id) == ()
+    assert catalog_adapter.list_products_for_shop(str(shop_id)) == ()
+    assert calls == [(shop_id, 50)]
+
+
+def test_custom_redis_clients_share_a_pool():
+    """Clients for the same Redis database reuse one connection pool."""
+    from database.redis.client import get_redis_client
+
+    first = get_redis_client(host="redis.example", port=6380, db=1)
+    second = get_redis_client(host="redis.example", port=6380, db=1)
+    other = get_redis_client(host="redis.example", port=6380, db=2)
+
+    assert first.connection_pool is second.connection_pool
+    assert other.connection_pool is not first.connection_pool
+    assert first.connection_pool.max_connections == 64
+
+
+def test_conversation_message_bytes_round_trip():
+    """Messages stored in the Redis buffer decode back to equal models."""
+    from database.redis.models import ConversationMessage, MessageMetadata
+
+    message = ConversationMessage(
+        role="user",
+        content="Xin chào, tôi muốn mua điện thoại",
+        timestamp=1700000000,
+        metadata=MessageMetadata(tokens=12, intent="purchase"),
+    )
+    payload = message.to_bytes()
+
+    assert ConversationMessage.from_bytes(payload) == message
+    # Clients with decode_responses=True hand back str
+    assert ConversationMessage.from_bytes(payload.decode()) == message
+    # Entries written before the switch to orjson still decode
+    assert ConversationMessage.from_bytes(message.model_dump_json()) == message
+
+
+def test_milvus_search_params_follow_existing_index():
+    """Default searches use the metric of the collection's index, including legacy ones."""
+    from database.milvus.schema import _search_params_for
+
+    legacy = {"metric_type": "L2", "index_type": "IVF_FLAT", "params": {"nlist": 1024}}
+    current = {"metric_type": "IP", "index_type": "HNSW", "params": {"M": 16}}
+
+    assert _search_params_for(legacy) == {"metric_type": "L2", "params": {"nprobe": 10}}
+    assert _search_params_for(current) == {"metric_type": "IP", "params": {"ef": 64}}
@@ -0,0 +1,33 @@
+"""Tests for the guardrail agent."""
+
+import asyncio
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+from pydantic_ai.exceptions import UnexpectedModelBehavior
+
+from agents.guardrail_agent import GuardrailAgent
+from agents.models import GuardrailInput
+
+
+async def test_streaming_falls_back_when_model_output_is_unusable(monkeypatch):
+    """Test that an unusable streamed answer approves the text and flags it for review."""
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    agent = GuardrailAgent()
+
+    @asynccontextmanager
+    async def run_stream(prompt):
+        raise UnexpectedModelBehavior("invalid JSON")
+        yield
+
+    monkeypatch.setattr(agent, "agent", SimpleNamespace(run_stream=run_stream))
+    approved_future = asyncio.get_running_loop().create_future()
+
+    output = await agent.run(
+        GuardrailInput(response_text="Streaming fallback test reply"),
+        approved_future=approved_future,
+    )
+
+    assert output.approved is True
+    assert output.sales_doublecheck is True
+    assert approved_future.result() is True
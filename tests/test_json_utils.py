@@ -0,0 +1,68 @@
+"""Tests for LLM response JSON helpers."""
+
+from typing import Optional
+
+from pydantic import BaseModel
+
+from agents._json_utils import extract_json, load_json_object, try_parse_agent_json
+
+
+class _Output(BaseModel):
+    label: str
+    score: float
+    note: Optional[str] = None
+
+
+def test_extract_json_plain_object():
+    """Test extracting a bare JSON object."""
+    assert extract_json('{"a": 1}') == '{"a": 1}'
+
+
+def test_extract_json_with_surrounding_prose():
+    """Test that prose and a second block after the first object are ignored."""
+    text = 'Here you go:\n{"a": {"b": 2}}\nAnd also {"c": 3}'
+    assert extract_json(text) == '{"a": {"b": 2}}'
+
+
+def test_extract_json_braces_inside_strings():
+    """Test that braces and escaped quotes inside strings do not affect depth."""
+    text = '{"text": "xin chào {bạn} \\"}\\"", "n": 1} trailing'
+    assert extract_json(text) == '{"text": "xin chào {bạn} \\"}\\"", "n": 1}'
+
+
+def test_extract_json_not_found():
+    """Test missing or unbalanced JSON returns None."""
+    assert extract_json("no json here") is None
+    assert extract_json('{"a": 1') is None
+
+
+def test_load_json_object():
+    """Test direct parse, extraction from prose, and rejection of non-objects."""
+    assert load_json_object('{"a": 1}') == {"a": 1}
+    assert load_json_object('{"a": 1} and more text') == {"a": 1}
+    assert load_json_object('Result:\n{"a": {"b": 2}}') == {"a": {"b": 2}}
+    assert load_json_object("[1, 2]") is None
+    assert load_json_object("nothing") is None
+
+
+def test_load_json_object_json5_fallback():
+    """Test that trailing commas, single quotes and comments are tolerated."""
+    text = "Sure: {'label': 'VIP', // best tier\n score: 0.9,}"
+    assert load_json_object(text) == {"label": "VIP", "score": 0.9}
+
+
+def test_try_parse_agent_json_defaults_and_failures():
+    """Test that defaults fill missing fields and invalid output returns None."""
+    parsed = try_parse_agent_json('{"label": "vip"}', _Output, defaults={"score": 0.9})
+    assert parsed == _Output(label="vip", score=0.9)
+
+    assert try_parse_agent_json("no json", _Output) is None
+    assert try_parse_agent_json('{"label": 1}', _Output) is None
+
+
+def test_try_parse_agent_json_structured_output():
+    """Test that dict and model outputs skip JSON decoding."""
+    model = _Output(label="vip", score=1.0)
+
+    assert try_parse_agent_json(model, _Output) is model
+    assert try_parse_agent_json({"label": "vip"}, _Output, defaults={"score": 1.0}) == model
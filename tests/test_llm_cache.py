@@ -0,0 +1,45 @@
+"""Tests for the LLM response cache."""
+
+from agents._llm_cache import LLMCache, MemoryLRU, make_key
+
+
+def test_make_key_separates_parts():
+    """Test that part boundaries are part of the key."""
+    assert make_key("ab", "c") != make_key("a", "bc")
+    assert make_key("a", "b") == make_key("a", "b")
+
+
+async def test_memory_lru_evicts_least_recently_used():
+    """Test LRU eviction order."""
+    cache = LLMCache(backend=MemoryLRU(max_size=2))
+    await cache.set("a", b"1")
+    await cache.set("b", b"2")
+    assert await cache.get("a") == b"1"
+    await cache.set("c", b"3")
+    assert await cache.get("b") is None
+    assert await cache.get("a") == b"1"
+    assert await cache.get("c") == b"3"
+
+
+async def test_memory_lru_expires_entries():
+    """Test that expired entries are treated as misses."""
+    cache = LLMCache(backend=MemoryLRU())
+    await cache.set("a", b"1", ttl=-1)
+    assert await cache.get("a") is None
+
+
+async def test_disabled_cache():
+    """Test that a cache without backend never hits."""
+    cache = LLMCache(backend=None)
+    await cache.set("a", b"1")
+    assert await cache.get("a") is None
+
+
+async def test_for_agent_disables_excluded_agents():
+    """Test that excluded agents get a cache that never stores or returns entries."""
+    cache = LLMCache(backend=MemoryLRU(), exclude=frozenset({"SalesAgent"}))
+    assert cache.for_agent("UpSalesCrossSalesAgent") is cache
+
+    excluded = cache.for_agent("SalesAgent")
+    await excluded.set("a", b"1")
+    assert await excluded.get("a") is None
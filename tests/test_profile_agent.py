@@ -0,0 +1,65 @@
+"""Tests for the profile agent's rule-based labelling."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from agents.models import HistoricalData, ProfileAgentInput, ProfileAgentOutput
+from agents.profile_agent import ProfileAgent, _rule_based_label
+
+LABELS = ["VIP", "tiềm năng", "bình thường", "chí tôn"]
+
+
+@pytest.mark.parametrize(
+    "orders, spend, days, expected",
+    [
+        # Big spender, recently active
+        (20, 60_000_000, 10, ("VIP", 0.95, 5)),
+        # Big spender who has lapsed: recency wins
+        (20, 60_000_000, 200, ("bình thường", 0.9, 0)),
+        # Regular mid-value buyer
+        (8, 15_000_000, 60, ("tiềm năng", 0.9, 3)),
+        # Lapsed low-value customer
+        (1, 100_000, 365, ("bình thường", 0.9, 0)),
+        # No rule applies
+        (2, 1_000_000, 20, None),
+        (3, 15_000_000, 20, None),
+    ],
+)
+def test_rule_based_label(orders, spend, days, expected):
+    """Test each labelling rule and the no-rule case."""
+    hist = HistoricalData(total_orders=orders, total_spend=spend, last_purchase_days=days)
+    assert _rule_based_label(hist, LABELS) == expected
+
+
+def test_rule_based_label_requires_label_in_definitions():
+    """Test that a rule is skipped when its label is not among the definitions."""
+    hist = HistoricalData(total_orders=20, total_spend=60_000_000, last_purchase_days=10)
+    assert _rule_based_label(hist, ["tiềm năng", "bình thường"]) is None
+
+
+async def test_unmatched_customer_falls_through_to_model(monkeypatch):
+    """Test that customers no rule covers are profiled by the model."""
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    agent = ProfileAgent()
+    prompts = []
+    expected = ProfileAgentOutput(customer_label="tiềm năng", confidence=0.7, priority_score=2)
+
+    async def run(prompt):
+        prompts.append(prompt)
+        return SimpleNamespace(output=expected)
+
+    agent.agent = SimpleNamespace(run=run)
+
+    output = await agent.run(
+        ProfileAgentInput(
+            user_id="u1",
+            historical_data=HistoricalData(
+                total_orders=2, total_spend=1_000_000, last_purchase_days=20
+            ),
+            label_definitions=LABELS,
+        )
+    )
+
+    assert len(prompts) == 1
+    assert output == expected
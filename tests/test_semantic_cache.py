@@ -0,0 +1,43 @@
+"""Tests for the embedding-based semantic cache."""
+
+import numpy as np
+
+from agents._semantic_cache import SemanticCache
+
+
+class _FakeEmbedCache(SemanticCache):
+    """SemanticCache with a fixed lookup table instead of a real embedding model."""
+
+    VECTORS = {
+        "my order is late": [1.0, 0.0, 0.0],
+        "order hasn't arrived": [0.98, 0.2, 0.0],
+        "i want a refund": [0.0, 0.0, 1.0],
+    }
+
+    def _embed_sync(self, text: str) -> np.ndarray:
+        vector = np.asarray(self.VECTORS[text], dtype=np.float32)
+        return (vector / np.linalg.norm(vector)).astype(np.float16)
+
+
+async def test_semantic_cache_hit_and_miss():
+    """Test that paraphrases hit and unrelated messages miss."""
+    cache = _FakeEmbedCache(threshold=0.92)
+    assert await cache.lookup("intent:vi", "my order is late") is None
+
+    await cache.add("intent:vi", "my order is late", b'{"intent_code": "complaint"}')
+    assert await cache.lookup("intent:vi", "order hasn't arrived") == b'{"intent_code": "complaint"}'
+    assert await cache.lookup("intent:vi", "i want a refund") is None
+    assert await cache.lookup("intent:en", "order hasn't arrived") is None
+
+
+async def test_semantic_cache_save_and_load(tmp_path):
+    """Test persisting the index to disk and reloading it."""
+    cache = _FakeEmbedCache(max_entries=1, cache_dir=str(tmp_path))
+    await cache.add("intent:vi", "i want a refund", b"old")
+    await cache.add("intent:vi", "my order is late", b"new")
+    cache.save()
+
+    reloaded = _FakeEmbedCache(cache_dir=str(tmp_path))
+    reloaded.load()
+    assert await reloaded.lookup("intent:vi", "order hasn't arrived") == b"new"
+    assert await reloaded.lookup("intent:vi", "i want a refund") is None
@@ -0,0 +1,58 @@
+"""Tests for LLM call time limits."""
+
+import asyncio
+
+import pytest
+
+from agents._timeouts import run_with_timeout
+
+
+async def test_run_with_timeout_retries_slow_attempt():
+    """Test that a timed-out attempt is retried and the fast retry wins."""
+    delays = [1.0, 0.0]
+
+    async def call(value):
+        await asyncio.sleep(delays.pop(0))
+        return value
+
+    assert await run_with_timeout(call, "ok", timeout=0.05) == "ok"
+    assert delays == []
+
+
+async def test_run_with_timeout_gives_up():
+    """Test that TimeoutError is raised once every attempt has timed out."""
+
+    async def call():
+        await asyncio.sleep(1.0)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await run_with_timeout(call, timeout=0.01, retries=1)
+
+
+async def test_sales_agent_falls_back_when_every_attempt_times_out(monkeypatch):
+    """Test that a timed-out Gemini call yields the agent's default reply instead of raising."""
+    from types import SimpleNamespace
+
+    from agents import _timeouts
+    from agents.models import Requirements, SalesAgentInput
+    from agents.sales_agent import SalesAgent
+
+    monkeypatch.setenv("GEMINI_API_KEY", "test")
+    monkeypatch.setattr(_timeouts, "REQUEST_TIMEOUT", 0.01)
+    agent = SalesAgent()
+
+    async def run(prompt):
+        await asyncio.sleep(1.0)
+
+    agent.agent = SimpleNamespace(run=run)
+
+    output = await agent.run(
+        SalesAgentInput(
+            customer_label="timeout test",
+            sales_node="greeting",
+            requirements=Requirements(),
+        )
+    )
+
+    assert output.response_text == "Xin chào! Tôi có thể giúp gì cho bạn?"
+    assert output.stay_in_sales_node is True
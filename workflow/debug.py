@@ -2,10 +2,13 @@
 
 import os
 import json
+from functools import lru_cache
 from typing import Dict, Any, Optional
 from agents.models import IntentAgentOutput, AnalyseHandoffOutput
 
 
+# Checked for every agent result, so the environment is only read once
+@lru_cache(maxsize=1)
 def is_debug_enabled() -> bool:
     """Check if debug mode is enabled.
 
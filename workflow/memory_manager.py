@@ -1,12 +1,15 @@
 """Memory Manager - Handles input reception and memory management."""
 
-import asyncio
 from typing import Optional, Dict, Any, Literal
 from datetime import datetime
 from database.redis import RedisMemoryManager
 from database.postgres.models import Message as MessageModel
 from database.postgres.client import get_postgres_session
-from database.postgres.session_service import get_session, update_session_handoff
+from database.postgres.session_service import (
+    bulk_insert_messages,
+    get_session,
+    update_session_handoff,
+)
 from database.debug import is_debug_enabled
 from workflow.debug import (
     print_memory_input,
@@ -87,8 +90,7 @@ class MemoryManager:
             pass
 
         # Check if we need to apply sliding window
-        messages = self.redis_memory.get_conversation_history()
-        if len(messages) > self.max_buffer_messages:
+        if self.redis_memory.conversation.count() > self.max_buffer_messages:
             await self._apply_sliding_window()
 
         # Check if we need to trigger summary (after 50 messages saved to PostgreSQL)
@@ -139,7 +141,7 @@ class MemoryManager:
                 # If session_id is not valid UUID, skip saving
                 return
 
-            message_objects = []
+            rows = []
             for msg in messages:
                 # Extract tool_calls from metadata if exists
                 tool_calls = None
@@ -148,21 +150,23 @@ class MemoryManager:
                     if isinstance(msg.metadata, dict) and "tool_calls" in msg.metadata:
                         tool_calls = msg.metadata["tool_calls"]
 
-                message_obj = MessageModel(
-                    session_id=session_uuid,
-                    role=msg.role,
-                    content=msg.content,
-                    tool_calls=tool_calls,
-                    token_count=msg.metadata.tokens if hasattr(msg.metadata, "tokens") else 0,
-                    created_at=datetime.fromtimestamp(msg.timestamp),
+                rows.append(
+                    {
+                        "session_id": session_uuid,
+                        "role": msg.role,
+                        "content": msg.content,
+                        "tool_calls": tool_calls,
+                        "token_count": (
+                            msg.metadata.tokens if hasattr(msg.metadata, "tokens") else 0
+                        ),
+                        "created_at": datetime.fromtimestamp(msg.timestamp),
+                    }
                 )
-                message_objects.append(message_obj)
 
-            db_session.add_all(message_objects)
-            db_session.commit()
+            saved = bulk_insert_messages(rows, db_session=db_session)
 
             if is_debug_enabled():
-                print(f"💾 Saved {len(message_objects)} messages to PostgreSQL")
+                print(f"💾 Saved {saved} messages to PostgreSQL")
         except Exception as e:
             db_session.rollback()
             if is_debug_enabled():
@@ -291,19 +295,13 @@ class MemoryManager:
             ]
 
             # Get session to retrieve old summary
-            session = get_session(self.session_id)
+            session = get_session(self.session_id, db_session=db_session)
             old_summary = None
             if session and session.session_metadata:
                 old_summary = session.session_metadata.get("summary")
 
             # Run both summary tasks in parallel
-            user_info_task = summary_agent.extract_user_information(messages_dict)
-            summary_task = summary_agent.summarize_conversation(messages_dict, old_summary)
-
-            user_info, summary_result = await asyncio.gather(
-                user_info_task,
-                summary_task,
-            )
+            user_info, summary_result = await summary_agent.run_both(messages_dict, old_summary)
 
             # Debug: Print extracted user info
             print_user_info_extraction(user_info)
@@ -348,7 +346,7 @@ class MemoryManager:
         db_session = get_postgres_session()
         try:
             # Get session to find user_id and shop_id
-            session = get_session(self.session_id)
+            session = get_session(self.session_id, db_session=db_session)
             if not session:
                 return
 
@@ -391,19 +389,14 @@ class MemoryManager:
             summary_result: Summary result with summary, tags, key_topics
         """
         try:
-            session = get_session(self.session_id)
-            if not session:
-                return
-
-            # Get existing metadata or create new
-            metadata = session.session_metadata or {}
-            metadata["summary"] = summary_result.get("summary", "")
+            # Send only the changed keys; update_session_handoff merges them
+            # into the stored metadata inside Postgres
+            metadata = {"summary": summary_result.get("summary", "")}
             if summary_result.get("tags"):
                 metadata["tags"] = summary_result["tags"]
             if summary_result.get("key_topics"):
                 metadata["key_topics"] = summary_result["key_topics"]
 
-            # Update session
             update_session_handoff(
                 session_id=self.session_id,
                 handoff_reason=None,  # Don't change handoff_reason
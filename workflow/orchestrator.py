@@ -50,6 +50,14 @@ class WorkflowOrchestrator:
         self.guardrail_agent = GuardrailAgent()
         self._memory_managers: Dict[str, MemoryManager] = {}
 
+    def end_session(self, session_id: str) -> None:
+        """Drop the in-process state kept for a finished chat session.
+
+        Args:
+            session_id: Session identifier
+        """
+        self._memory_managers.pop(session_id, None)
+
     async def process_user_message(
         self,
         user_id: str,
@@ -143,65 +151,43 @@ class WorkflowOrchestrator:
             language=language,
         )
 
-        # Phase 1: Initial analysis (parallel)
-        phase_trace.append("Phase 1: IntentAgent + AnalyseHandoffAgent (parallel)")
-        intent_result, handoff_result = await asyncio.gather(
-            self.intent_agent.run(intent_input),
-            self.analyse_handoff_agent.run(handoff_input),
+        # Short-term memory for downstream agents
+        short_memory = memory_manager.get_conversation_history(max_messages=20)
+        # Convert ConversationMessage objects to simple dicts (agents expect list-like)
+        short_memory_dicts = []
+        for m in short_memory:
+            if hasattr(m, "role") and hasattr(m, "content"):
+                short_memory_dicts.append({"role": m.role, "content": m.content})
+            else:
+                short_memory_dicts.append(m)
+
+        # Sales stages that only need the raw message or user id start now, so they
+        # overlap intent/handoff/orchestration instead of running after them.
+        predict_input = PredictRequirementInput(
+            latest_message=raw_message,
+            short_memory=short_memory_dicts,
+            sales_node="greeting",
         )
-
-        # Prepare orchestrator input from both results
-        orchestrator_input = OrchestratorAgentInput(
+        # No real historical data wired yet; safe defaults
+        profile_input = ProfileAgentInput(
             user_id=user_id,
-            clean_intent_text=intent_result.clean_intent_text,
-            intent_code=intent_result.intent_code,
-            policy_flags=handoff_result.policy_flags,
-            emotion_score=handoff_result.emotion_score,
-            handoff_required=handoff_result.handoff_required,
-            handoff_reason=handoff_result.handoff_reason,
-            risk_level=handoff_result.risk_level,
-        )
-
-        phase_trace.append("Phase 1: OrchestratorAgent (task selection)")
-        orchestrator_result = await self.orchestrator_agent.run(orchestrator_input)
-
-        # Update active context with intent and handoff info
-        memory_manager.update_active_context(
-            extracted_entities={"intent_code": intent_result.intent_code},
+            historical_data=HistoricalData(total_orders=0, total_spend=0.0, last_purchase_days=0),
+            label_definitions=["VIP", "tiềm năng", "bình thường", "chí tôn"],
         )
-
-        final_response_text: str
-        phase_trace.append(f"Phase 1 result: task={orchestrator_result.task}")
-
-        # Phase 2/3: Sales pipeline
-        # Note: We *continue* the conversation even when task == human_handle.
-        # "human_handle" here means "escalate/flag for human", not "stop responding".
-        # This prevents the chat from feeling like it resets every turn.
-        phase_trace.append("Phase 2: Sales workflow")
-        if orchestrator_result.task in {"sales_task", "human_handle"}:
-
-            # Short-term memory for downstream agents
-            phase_trace.append("Phase 2.0: Load short memory")
-            short_memory = memory_manager.get_conversation_history(max_messages=20)
-            # Convert ConversationMessage objects to simple dicts (agents expect list-like)
-            short_memory_dicts = []
-            for m in short_memory:
-                if hasattr(m, "role") and hasattr(m, "content"):
-                    short_memory_dicts.append({"role": m.role, "content": m.content})
-                else:
-                    short_memory_dicts.append(m)
-
-            # 2.1 Predict requirements
-            phase_trace.append("Phase 2.1: PredictRequirementAgent")
-            predict_input = PredictRequirementInput(
-                latest_message=raw_message,
-                short_memory=short_memory_dicts,
-                sales_node="greeting",
+        speculative_tasks: list[asyncio.Task] = []
+        try:
+            predict_task = asyncio.create_task(self.predict_requirement_agent.run(predict_input))
+            profile_task = asyncio.create_task(self.profile_agent.run(profile_input))
+            speculative_tasks += [predict_task, profile_task]
+
+            # Phase 1: Initial analysis (parallel)
+            phase_trace.append("Phase 1: IntentAgent + AnalyseHandoffAgent (parallel)")
+            intent_result, handoff_result = await asyncio.gather(
+                self.intent_agent.run(intent_input),
+                self.analyse_handoff_agent.run(handoff_input),
             )
-            requirement_result = await self.predict_requirement_agent.run(predict_input)
 
-            # 2.2 Classify sales step
-            phase_trace.append("Phase 2.2: ClassifyStepAgent")
+            # Classification only needs the clean intent, so it overlaps orchestration
             default_nodes = [
                 "greeting",
                 "need_discovery",
@@ -214,17 +200,57 @@ class WorkflowOrchestrator:
                 clean_intent_text=intent_result.clean_intent_text,
                 sales_graph=SalesGraph(nodes=default_nodes, current_node="greeting"),
             )
-            step_result = await self.classify_step_agent.run(classify_input)
+            classify_task = asyncio.create_task(self.classify_step_agent.run(classify_input))
+            speculative_tasks.append(classify_task)
 
-            # 2.3 Profile customer (no real historical data wired yet; safe defaults)
-            phase_trace.append("Phase 2.3: ProfileAgent")
-            profile_input = ProfileAgentInput(
+            # Prepare orchestrator input from both results
+            orchestrator_input = OrchestratorAgentInput(
                 user_id=user_id,
-                historical_data=HistoricalData(total_orders=0, total_spend=0.0, last_purchase_days=0),
-                label_definitions=["VIP", "tiềm năng", "bình thường", "chí tôn"],
+                clean_intent_text=intent_result.clean_intent_text,
+                intent_code=intent_result.intent_code,
+                policy_flags=handoff_result.policy_flags,
+                emotion_score=handoff_result.emotion_score,
+                handoff_required=handoff_result.handoff_required,
+                handoff_reason=handoff_result.handoff_reason,
+                risk_level=handoff_result.risk_level,
+            )
+
+            phase_trace.append("Phase 1: OrchestratorAgent (task selection)")
+            orchestrator_result = await self.orchestrator_agent.run(orchestrator_input)
+
+            # Update active context with intent and handoff info
+            memory_manager.update_active_context(
+                extracted_entities={"intent_code": intent_result.intent_code},
             )
-            profile_result = await self.profile_agent.run(profile_input)
 
+            final_response_text: str
+            phase_trace.append(f"Phase 1 result: task={orchestrator_result.task}")
+
+            # Phase 2/3: Sales pipeline
+            # Note: We *continue* the conversation even when task == human_handle.
+            # "human_handle" here means "escalate/flag for human", not "stop responding".
+            # This prevents the chat from feeling like it resets every turn.
+            phase_trace.append("Phase 2: Sales workflow")
+            is_sales_turn = orchestrator_result.task in {"sales_task", "human_handle"}
+            if is_sales_turn:
+                # 2.1-2.3 Predict requirements, classify sales step, profile customer
+                # (already started during Phase 1)
+                phase_trace.append(
+                    "Phase 2.1-2.3: PredictRequirementAgent + ClassifyStepAgent + ProfileAgent (parallel)"
+                )
+                requirement_result, step_result, profile_result = await asyncio.gather(
+                    predict_task, classify_task, profile_task
+                )
+        finally:
+            # Speculative sales stages are cancelled if this turn fails early or is not
+            # a sales turn; failures of finished ones are retrieved so they are not logged
+            for task in speculative_tasks:
+                if not task.done():
+                    task.cancel()
+                elif not task.cancelled():
+                    task.exception()
+
+        if is_sales_turn:
             # 2.4 Upsell/cross-sell (no inventory wired yet; use demo combos)
             phase_trace.append("Phase 2.4: UpSalesCrossSalesAgent")
 
@@ -327,11 +353,27 @@ class WorkflowOrchestrator:
             # Phase 3: Guardrail
             phase_trace.append("Phase 3: GuardrailAgent")
             guardrail_input = GuardrailInput(response_text=sales_result.response_text, product_data=None)
-            guardrail_result = await self.guardrail_agent.run(guardrail_input)
+            approved_future = asyncio.get_running_loop().create_future()
+            guardrail_task = asyncio.create_task(
+                self.guardrail_agent.run(guardrail_input, approved_future=approved_future)
+            )
 
-            if guardrail_result.approved:
+            try:
+                approved = await approved_future
+            except BaseException:
+                # The guardrail failed (its error is copied onto the future) or this turn
+                # was cancelled: stop the task and retrieve its outcome so it is not logged
+                guardrail_task.cancel()
+                await asyncio.gather(guardrail_task, return_exceptions=True)
+                raise
+
+            if approved:
+                guardrail_result = await guardrail_task
                 final_response_text = guardrail_result.modified_text or sales_result.response_text
             else:
+                # Rejected: the rest of the guardrail output is not needed
+                guardrail_task.cancel()
+                await asyncio.gather(guardrail_task, return_exceptions=True)
                 # Safe fallback if rejected
                 final_response_text = (
                     "Mình chưa thể trả lời chắc chắn nội dung này ngay lúc này. "